@@ -1,11 +1,20 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
 
 from demoproject.compat import reverse
+from django_genericfilters.testing import QueryBudgetTestMixin
 
 
 class FilteredListView(TestCase):
     fixtures = ["test_data.json"]
 
+    def setUp(self):
+        cache.clear()
+
     def test_empty_get(self):
         url = reverse("user_filter_view")
         response = self.client.get(url)
@@ -21,3 +30,105 @@ class FilteredListView(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.context["users"]), 1)
+
+    def test_fragments(self):
+        url = reverse("user_filter_view") + "?query=doe"
+        response = self.client.get(url, HTTP_X_FRAGMENTS="results,filters")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Fragments"], "results,filters")
+        self.assertNotContains(response, "<html>")
+        self.assertContains(response, "<table")
+        self.assertContains(response, 'id="search_form"')
+
+    def test_fragments_unchanged_filters(self):
+        url = reverse("user_filter_view") + "?query=doe&page=1"
+        response = self.client.get(
+            url,
+            HTTP_X_FRAGMENTS="results,filters",
+            HTTP_HX_CURRENT_URL="http://testserver/filter/?page=2&query=doe",
+        )
+        self.assertEqual(response["X-Fragments"], "results")
+        self.assertNotContains(response, 'id="search_form"')
+        self.assertIn("HX-Current-URL", response["Vary"])
+        self.assertNotIn("filters", response.context)
+
+    def test_json(self):
+        url = reverse("user_filter_view") + "?format=json&query=doe"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        data = response.json()
+        self.assertEqual(len(data["results"]), 1)
+        self.assertNotIn("password", data["results"][0])
+        self.assertEqual(data["pagination"]["count"], 1)
+        self.assertEqual(data["pagination"]["page"], 1)
+        self.assertEqual(
+            [f["name"] for f in data["filters"]],
+            ["is_active", "is_staff", "is_superuser"],
+        )
+        self.assertEqual(data["filters"][0]["choices"][0]["label"], "All")
+
+    def test_json_accept_header(self):
+        url = reverse("user_filter_view")
+        response = self.client.get(url, HTTP_ACCEPT="application/json")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIn("results", response.json())
+        self.assertIn("Accept", response["Vary"])
+        self.assertIn("Accept", self.client.get(url)["Vary"])
+
+    def test_bulk_action(self):
+        url = reverse("user_filter_view") + "?is_staff=yes"
+        active = User.objects.filter(is_active=True).count()
+        response = self.client.post(url, {"bulk_action": "deactivate"})
+        self.assertEqual(403, response.status_code)
+        self.assertNotContains(self.client.get(url), "Deactivate all")
+        self.assertEqual(active, User.objects.filter(is_active=True).count())
+
+        admin = User.objects.create(username="bulk-admin", is_superuser=True)
+        self.client.force_login(admin)
+        self.assertContains(self.client.get(url), "Deactivate all")
+        invalid = reverse("user_filter_view") + "?is_staff=bogus"
+        response = self.client.post(invalid, {"bulk_action": "deactivate"})
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(active + 1, User.objects.filter(is_active=True).count())
+
+        response = self.client.post(url, {"bulk_action": "deactivate"}, follow=True)
+        self.assertContains(response, "deactivate: 2 objects")
+        self.assertEqual(
+            [1, 4, 5],
+            sorted(User.objects.filter(is_active=False).values_list("pk", flat=True)),
+        )
+
+    def test_saved_search(self):
+        url = reverse("user_filter_view") + "?saved=active-staff"
+        response = self.client.get(url)
+        self.assertIsNone(response.context["saved_search"].refreshed)
+        self.assertEqual([1, 5], sorted(u.pk for u in response.context["users"]))
+
+        out = StringIO()
+        err = StringIO()
+        call_command("genericfilters_refresh_saved_searches", stdout=out, stderr=err)
+        self.assertIn("/filter/ active-staff: 2 objects", out.getvalue())
+        # The demo uses the default LocMemCache, in the process of the tests.
+        self.assertIn("'default' cache is local to this process", err.getvalue())
+
+        User.objects.filter(pk=5).update(is_staff=False)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual("active-staff", response.context["saved_search"].name)
+        self.assertIsNotNone(response.context["saved_search"].refreshed)
+        self.assertEqual(2, response.context["paginator"].count)
+        self.assertEqual([5, 1], [u.pk for u in response.context["users"]])
+
+
+class QueryBudgetTestCase(QueryBudgetTestMixin, TestCase):
+    fixtures = ["test_data.json"]
+    query_budget_data = {"/filter/": {"is_active": "yes", "query": "doe"}}
+
+    def test_query_budgets__logged_in(self):
+        for user in [
+            User.objects.create(username="budget-admin", is_superuser=True),
+            User.objects.create(username="budget-staff", is_staff=True),
+        ]:
+            self.client.force_login(user)
+            self.test_query_budgets()
@@ -16,6 +16,16 @@ class UserListView(FilteredListView):
     search_fields = ["first_name", "last_name", "username", "email"]
     filter_fields = ["is_active", "is_staff", "is_superuser"]
     default_order = "last_name"
+    # Logged-in users add the session, the user and its permissions (for
+    # the bulk actions form) to the count and the page.
+    query_budget = {"html": 6, "json": 2}
+    json_fields = ["id", "username", "first_name", "last_name", "email", "is_active"]
+    bulk_actions = {"activate": {"is_active": True}, "deactivate": {"is_active": False}}
+    bulk_action_permission = "auth.change_user"
+    saved_searches = {"active-staff": {"is_active": "yes", "is_staff": "yes"}}
+    fragment_templates = dict(
+        FilteredListView.fragment_templates, results="user/user_table.html"
+    )
 
 
 user_list_view = UserListView.as_view()
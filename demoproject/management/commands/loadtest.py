@@ -0,0 +1,175 @@
+"""Load test the demo user list view under concurrency."""
+
+import random
+import threading
+import time
+from collections import defaultdict
+from urllib.error import URLError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+
+from demoproject.compat import reverse
+
+FIRST_NAMES = ["John", "Jane", "Marie", "Pierre", "Anna", "Paul", "Lea", "Hugo"]
+LAST_NAMES = ["Doe", "Martin", "Bernard", "Dubois", "Durand", "Leroy", "Moreau"]
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    index = max(0, int(round(percent / 100.0 * len(values))) - 1)
+    return values[min(index, len(values) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a mix of filter, search, order and deep-page requests against "
+        "the user list view and report throughput and latency per scenario."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument(
+            "--base-url",
+            default=None,
+            help="Send HTTP requests to a running server, e.g. "
+            "http://localhost:8000. Requests go through the WSGI handler "
+            "in-process by default.",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.seed_users(options["users"])
+        self.num_pages = max(1, User.objects.count() // 10)
+        self.base_url = options["base_url"]
+        self.path = reverse("user_filter_view")
+
+        scenarios = [
+            self.random.choice(list(self.scenarios)) for i in range(options["requests"])
+        ]
+        results = defaultdict(list)
+        errors = defaultdict(int)
+        lock = threading.Lock()
+
+        def worker():
+            client = Client(HTTP_HOST="localhost")
+            try:
+                while True:
+                    with lock:
+                        if not scenarios:
+                            return
+                        name = scenarios.pop()
+                        params = self.scenarios[name](self)
+                    start = time.perf_counter()
+                    ok = self.request(client, params)
+                    elapsed = time.perf_counter() - start
+                    with lock:
+                        results[name].append(elapsed)
+                        if not ok:
+                            errors[name] += 1
+            finally:
+                if threading.current_thread() is not threading.main_thread():
+                    connections.close_all()
+
+        start = time.perf_counter()
+        if options["concurrency"] <= 1:
+            worker()
+        else:
+            threads = [
+                threading.Thread(target=worker) for i in range(options["concurrency"])
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.report(results, errors, time.perf_counter() - start)
+
+    def seed_users(self, count):
+        existing = User.objects.count()
+        users = [
+            User(
+                username="loadtest%d" % i,
+                first_name=self.random.choice(FIRST_NAMES),
+                last_name=self.random.choice(LAST_NAMES),
+                email="loadtest%d@example.com" % i,
+                is_active=self.random.random() < 0.8,
+                is_staff=self.random.random() < 0.1,
+            )
+            for i in range(existing, count)
+        ]
+        User.objects.bulk_create(users, batch_size=1000)
+        if users:
+            self.stdout.write("Seeded %d users." % len(users))
+
+    def filter(self):
+        return {
+            "is_active": self.random.choice(["yes", "no"]),
+            "is_staff": self.random.choice(["", "yes", "no"]),
+        }
+
+    def search(self):
+        return {"query": self.random.choice(LAST_NAMES + FIRST_NAMES)[:4]}
+
+    def order(self):
+        return {
+            "order_by": self.random.choice(["date_joined", "last_login", "last_name"]),
+            "order_reverse": self.random.choice(["0", "1"]),
+        }
+
+    def deep_page(self):
+        return {"page": self.random.randint(self.num_pages // 2, self.num_pages)}
+
+    scenarios = {
+        "filter": filter,
+        "search": search,
+        "order": order,
+        "deep_page": deep_page,
+    }
+
+    def request(self, client, params):
+        """Send one request and return True if it succeeded."""
+        if self.base_url is None:
+            # The test client re-raises the exceptions of the view.
+            try:
+                return client.get(self.path, params).status_code == 200
+            except Exception:
+                return False
+        url = "%s%s?%s" % (self.base_url.rstrip("/"), self.path, urlencode(params))
+        try:
+            with urlopen(url) as response:
+                response.read()
+                return response.status == 200
+        except URLError:
+            return False
+
+    def report(self, results, errors, duration):
+        total = sum(len(timings) for timings in results.values())
+        self.stdout.write(
+            "%d requests in %.2fs: %.1f req/s" % (total, duration, total / duration)
+        )
+        self.stdout.write(
+            "%-10s %8s %8s %8s %8s %8s"
+            % ("scenario", "requests", "errors", "p50 ms", "p95 ms", "p99 ms")
+        )
+        for name in sorted(results):
+            timings = sorted(results[name])
+            self.stdout.write(
+                "%-10s %8d %8d %8.1f %8.1f %8.1f"
+                % (
+                    name,
+                    len(timings),
+                    errors[name],
+                    percentile(timings, 50) * 1000,
+                    percentile(timings, 95) * 1000,
+                    percentile(timings, 99) * 1000,
+                )
+            )
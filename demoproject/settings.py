@@ -67,6 +67,7 @@ INSTALLED_APPS = (
     "django.contrib.staticfiles",
     # The actual django-generic-filters demo.
     "django_genericfilters",
+    "django_genericfilters.counters",
     "demoproject",
     "demoproject.filter",
 )
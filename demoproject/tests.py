@@ -1,8 +1,14 @@
 # coding=utf8
 """Test suite for django-generic-filters."""
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.test import TestCase
 
 from demoproject.compat import reverse
+from demoproject.filter.views import UserListView
 
 
 class HomeViewTestCase(TestCase):
@@ -13,3 +19,31 @@ class HomeViewTestCase(TestCase):
         home_url = reverse("home")
         response = self.client.get(home_url)
         self.assertEqual(response.status_code, 200)
+
+
+class LoadTestCommandTestCase(TestCase):
+    """Test the loadtest management command."""
+
+    def test_loadtest(self):
+        """Users are seeded and every scenario is reported."""
+        out = StringIO()
+        call_command(
+            "loadtest", users=30, requests=40, concurrency=1, seed=1, stdout=out
+        )
+        self.assertEqual(User.objects.count(), 30)
+        output = out.getvalue()
+        self.assertIn("40 requests", output)
+        for scenario in ("filter", "search", "order", "deep_page"):
+            self.assertIn(scenario, output)
+
+    def test_loadtest_errors(self):
+        """Exceptions of the view are counted as errors."""
+        out = StringIO()
+        with mock.patch.object(UserListView, "get", side_effect=RuntimeError):
+            call_command(
+                "loadtest", users=30, requests=8, concurrency=1, seed=1, stdout=out
+            )
+        lines = out.getvalue().splitlines()
+        self.assertIn("8 requests", lines[1])
+        errors = sum(int(line.split()[2]) for line in lines[3:])
+        self.assertEqual(errors, 8)
@@ -0,0 +1,236 @@
+"""
+In-memory bitmap index of primary keys for low-cardinality filter fields.
+
+Each indexed (field, value) pair holds a bitmap where bit ``n`` is set when
+the row with ``pk == n`` has that value. Bitmaps are plain Python integers:
+intersections and population counts run in C and need no extra dependency.
+
+"""
+
+import re
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.models.signals import post_delete, post_init, post_save
+
+from . import parallel
+
+NONZERO_BYTES_RE = re.compile(b"[^\x00]+")
+
+
+def index_value(value):
+    """Return the value stored in the index for a filter value."""
+    return getattr(value, "pk", value)
+
+
+def bit_count(bitmap):
+    """Return the number of bits set in bitmap."""
+    try:
+        return bitmap.bit_count()
+    except AttributeError:  # Python < 3.10
+        return bin(bitmap).count("1")
+
+
+def iter_bits(bitmap):
+    """Yield the position of the bits set in bitmap, lowest first."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for match in NONZERO_BYTES_RE.finditer(data):
+        offset = match.start() * 8
+        for byte in match.group():
+            while byte:
+                lowest = byte & -byte
+                yield offset + lowest.bit_length() - 1
+                byte ^= lowest
+            offset += 8
+
+
+class BitmapIndex(object):
+    """
+    Index the primary keys of ``model`` by value for each of ``fields``.
+
+    The index is built on first use (or explicitly with :meth:`build`) and
+    kept current through ``post_save`` and ``post_delete`` signals once
+    :meth:`connect` has been called. Writes that bypass signals
+    (``QuerySet.update()``, ``bulk_create()``, other processes) are only
+    seen when :meth:`build` is called, or when the index is rebuilt in
+    another thread ``ttl`` seconds after the last build (never by default).
+
+    Only models with positive integer primary keys can be indexed.
+    ``max_pks`` is the largest number of matching rows for which
+    :meth:`pks` may be used to fetch a page with ``pk__in``.
+    """
+
+    def __init__(self, model, fields, max_pks=1000, ttl=None):
+        self.model = model
+        self.fields = tuple(fields)
+        self.max_pks = max_pks
+        self.ttl = ttl
+        self._built = None
+        self._refreshing = False
+        self._state = "_genericfilters_bitmap_%s" % id(self)
+        self._attnames = {
+            name: model._meta.get_field(name).attname for name in self.fields
+        }
+        self._bitmaps = None
+        self._lock = threading.RLock()
+
+    def build(self):
+        """(Re)build every bitmap from the database."""
+        bitmaps = {}
+        for name, attname in self._attnames.items():
+            rows = self.model._default_manager.values_list("pk", attname)
+            arrays = {}
+            for pk, value in rows.order_by().iterator():
+                if not isinstance(pk, int) or pk < 0:
+                    raise ImproperlyConfigured(
+                        "BitmapIndex requires positive integer primary keys."
+                    )
+                array = arrays.setdefault(value, bytearray())
+                byte = pk >> 3
+                if len(array) <= byte:
+                    array.extend(bytes(byte + 1 - len(array)))
+                array[byte] |= 1 << (pk & 7)
+            bitmaps[name] = {
+                value: int.from_bytes(array, "little")
+                for value, array in arrays.items()
+            }
+        with self._lock:
+            self._bitmaps = bitmaps
+            self._built = time.monotonic()
+
+    def invalidate(self):
+        """Rebuild every bitmap on next use."""
+        with self._lock:
+            self._bitmaps = None
+
+    def connect(self):
+        """Keep the index current through model signals."""
+        uid = "genericfilters_bitmap_%s" % id(self)
+        post_init.connect(self._on_init, sender=self.model, dispatch_uid=uid)
+        post_save.connect(self._on_save, sender=self.model, dispatch_uid=uid)
+        post_delete.connect(self._on_delete, sender=self.model, dispatch_uid=uid)
+
+    def disconnect(self):
+        uid = "genericfilters_bitmap_%s" % id(self)
+        post_init.disconnect(sender=self.model, dispatch_uid=uid)
+        post_save.disconnect(sender=self.model, dispatch_uid=uid)
+        post_delete.disconnect(sender=self.model, dispatch_uid=uid)
+
+    def _get_values(self, instance):
+        """Return the loaded {field: value} of instance."""
+        return {
+            name: instance.__dict__[attname]
+            for name, attname in self._attnames.items()
+            if attname in instance.__dict__
+        }
+
+    def _on_init(self, sender, instance, **kwargs):
+        instance.__dict__[self._state] = self._get_values(instance)
+
+    def _on_save(self, sender, instance, created=False, **kwargs):
+        old = {} if created else instance.__dict__.get(self._state, {})
+        new = self._get_values(instance)
+        instance.__dict__[self._state] = new
+        if self._bitmaps is None:
+            return
+        bit = 1 << instance.pk
+        with self._lock:
+            for name, value in new.items():
+                bitmaps = self._bitmaps[name]
+                if name in old:
+                    if old[name] == value:
+                        continue
+                    previous = [old[name]] if old[name] in bitmaps else []
+                elif created:
+                    previous = []
+                else:
+                    # The previous value was not loaded.
+                    previous = [v for v, rows in bitmaps.items() if rows & bit]
+                for v in previous:
+                    bitmaps[v] &= ~bit
+                bitmaps[value] = bitmaps.get(value, 0) | bit
+
+    def _on_delete(self, sender, instance, **kwargs):
+        if self._bitmaps is None:
+            return
+        old = instance.__dict__.get(self._state, {})
+        bit = 1 << instance.pk
+        with self._lock:
+            for name, bitmaps in self._bitmaps.items():
+                values = {old[name]} if name in old else set(bitmaps)
+                for value in values:
+                    if value in bitmaps and bitmaps[value] & bit:
+                        bitmaps[value] &= ~bit
+
+    def _get_bitmaps(self):
+        if self._bitmaps is None:
+            self.build()
+        elif self.ttl is not None and time.monotonic() - self._built > self.ttl:
+            self.refresh()
+        return self._bitmaps
+
+    def refresh(self):
+        """
+        Rebuild the index in another thread, serving the current bitmaps
+        meanwhile, or in this thread on in-memory databases.
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def rebuild():
+            try:
+                self.build()
+            finally:
+                self._refreshing = False
+
+        connection = connections[self.model._default_manager.db]
+        if parallel.can_run_in_threads(connection):
+            parallel.get_executor(1).submit(parallel.call, rebuild)
+        else:
+            rebuild()
+
+    def covers(self, filters):
+        """Return True if filters can be answered by the index."""
+        for key, value in filters.items():
+            if key not in self._attnames:
+                return False
+            try:
+                hash(index_value(value))
+            except TypeError:
+                return False
+        return True
+
+    def bitmap(self, filters):
+        """Return the bitmap of the rows matching every filter."""
+        bitmaps = self._get_bitmaps()
+        with self._lock:
+            if not filters:
+                # Any indexed field holds every row exactly once.
+                result = 0
+                for bitmap in bitmaps[self.fields[0]].values():
+                    result |= bitmap
+                return result
+            result = None
+            for key, value in filters.items():
+                bitmap = bitmaps[key].get(index_value(value), 0)
+                result = bitmap if result is None else result & bitmap
+            return result
+
+    def count(self, filters):
+        """Return the number of rows matching every filter."""
+        return bit_count(self.bitmap(filters))
+
+    def pks(self, filters):
+        """Return the sorted list of primary keys matching every filter."""
+        return list(iter_bits(self.bitmap(filters)))
+
+    def facet(self, field, filters):
+        """Return a dict of value: count for field within filters."""
+        bitmap = self.bitmap(filters)
+        with self._lock:
+            values = list(self._get_bitmaps()[field].items())
+        return {value: bit_count(bitmap & rows) for value, rows in values}
@@ -0,0 +1,17 @@
+"""
+Query budgets: the maximum number of queries a list view may run.
+"""
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its declared query_budget."""
+
+
+def format_budget_error(name, budget, queries):
+    """Return a message listing the queries of a request over budget."""
+    lines = [
+        "%s ran %d queries, its budget is %d:" % (name, len(queries), budget),
+    ]
+    for i, query in enumerate(queries, start=1):
+        lines.append("%d. %s" % (i, query["sql"]))
+    return "\n".join(lines)
@@ -0,0 +1,260 @@
+"""
+Cache backend storing entries in a memory-mapped file shared by every
+process of a host.
+
+Workers of a same host read the filter metadata computed by any of them
+(counts, facet counts, choices) without an external cache service::
+
+    CACHES = {
+        "genericfilters": {
+            "BACKEND": "django_genericfilters.cache.MmapCache",
+            "LOCATION": "/dev/shm/myproject-genericfilters",
+            "OPTIONS": {"SLOTS": 4096, "SLOT_SIZE": 4096},
+        },
+    }
+
+The file holds ``SLOTS`` fixed-size slots; a key is stored in the slot its
+hash maps to, evicting the previous entry. Reads take no lock: each slot
+carries a sequence number that writers make odd while they update it, and
+readers retry when it changed during their copy (a seqlock). Writers
+serialize with ``flock()``. ``clear()`` only bumps the generation number of
+the file, invalidating every entry at once.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+MAGIC = b"GFMC"
+FORMAT_VERSION = 1
+# magic, format version, slots, slot size, generation.
+FILE_HEADER = struct.Struct("<4sIIIQ")
+FILE_HEADER_SIZE = 64
+# sequence, generation, key digest, expiry (0 for none), length, crc32.
+SLOT_HEADER = struct.Struct("<QQ16sdII")
+SEQUENCE = struct.Struct("<Q")
+GENERATION_OFFSET = 16
+READ_RETRIES = 100
+
+
+class MmapCache(BaseCache):
+    """Django cache backend sharing entries through a memory-mapped file."""
+
+    def __init__(self, location, params):
+        super(MmapCache, self).__init__(params)
+        self.path = location
+        options = params.get("OPTIONS", {})
+        self.slots = int(options.get("SLOTS", 4096))
+        self.slot_size = int(options.get("SLOT_SIZE", 4096))
+        self.size = FILE_HEADER_SIZE + self.slots * self.slot_size
+        self._map = None
+        self._fd = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """Map the file, replacing it when its layout differs."""
+        expected = (MAGIC, FORMAT_VERSION, self.slots, self.slot_size)
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                header = os.pread(fd, FILE_HEADER.size, 0)
+                if os.fstat(fd).st_ino != os.stat(self.path).st_ino:
+                    # Replaced by another process while waiting for the lock.
+                    valid = False
+                elif (
+                    len(header) < FILE_HEADER.size
+                    or FILE_HEADER.unpack(header)[:4] != expected
+                    or os.fstat(fd).st_size != self.size
+                ):
+                    self._replace(expected)
+                    valid = False
+                else:
+                    valid = True
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            if valid:
+                break
+            os.close(fd)
+        self._map = mmap.mmap(fd, self.size)
+        self._fd = fd
+        self._pid = os.getpid()
+
+    def _replace(self, header):
+        """
+        Create an empty file with the layout of header in place of the
+        current one. Processes which mapped the current file keep it, as it
+        is never truncated under them.
+        """
+        path = "%s.%d.tmp" % (self.path, os.getpid())
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, self.size)
+            os.pwrite(fd, FILE_HEADER.pack(*header, 0), 0)
+        finally:
+            os.close(fd)
+        os.replace(path, self.path)
+
+    def _get_map(self):
+        # flock() locks are shared by processes forked after open().
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._open()
+        return self._map
+
+    def close(self, **kwargs):
+        pass
+
+    def _digest(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+    def _offset(self, digest):
+        index = int.from_bytes(digest[:8], "little") % self.slots
+        return FILE_HEADER_SIZE + index * self.slot_size
+
+    def _generation(self, data):
+        return SEQUENCE.unpack_from(data, GENERATION_OFFSET)[0]
+
+    def _read(self, digest):
+        """Return the payload stored for digest, or None, without locking."""
+        data = self._get_map()
+        offset = self._offset(digest)
+        for _ in range(READ_RETRIES):
+            sequence = SEQUENCE.unpack_from(data, offset)[0]
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            _, generation, stored, expires, length, crc = SLOT_HEADER.unpack_from(
+                data, offset
+            )
+            if (
+                stored != digest
+                or generation != self._generation(data)
+                or (expires and expires <= time.time())
+                or length > self.slot_size - SLOT_HEADER.size
+            ):
+                payload = None
+            else:
+                start = offset + SLOT_HEADER.size
+                payload = data[start : start + length]
+            if SEQUENCE.unpack_from(data, offset)[0] != sequence:
+                continue
+            if payload is None or zlib.crc32(payload) != crc:
+                return None
+            return payload
+        return None
+
+    def _write(self, digest, payload, expires):
+        """Store payload in the slot of digest. The caller holds the lock."""
+        data = self._map
+        offset = self._offset(digest)
+        sequence = SEQUENCE.unpack_from(data, offset)[0] | 1
+        SEQUENCE.pack_into(data, offset, sequence)
+        SLOT_HEADER.pack_into(
+            data,
+            offset,
+            sequence,
+            self._generation(data),
+            digest,
+            expires,
+            len(payload),
+            zlib.crc32(payload),
+        )
+        start = offset + SLOT_HEADER.size
+        data[start : start + len(payload)] = payload
+        SEQUENCE.pack_into(data, offset, sequence + 1)
+
+    def _locked(self):
+        return _FileLock(self)
+
+    def _expiry(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        return 0.0 if timeout is None else timeout
+
+    def _dumps(self, value):
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.slot_size - SLOT_HEADER.size:
+            return None
+        return payload
+
+    def get(self, key, default=None, version=None):
+        payload = self._read(self._digest(key, version))
+        if payload is None:
+            return default
+        try:
+            return pickle.loads(payload)
+        except Exception:
+            return default
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        digest = self._digest(key, version)
+        payload = self._dumps(value)
+        with self._locked():
+            if payload is not None:
+                self._write(digest, payload, self._expiry(timeout))
+            elif self._read(digest) is not None:
+                # Too large to be stored: do not leave the previous value.
+                self._write(digest, b"", -1.0)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        digest = self._digest(key, version)
+        if self._read(digest) is not None:
+            return False
+        payload = self._dumps(value)
+        if payload is None:
+            return False
+        with self._locked():
+            if self._read(digest) is not None:
+                return False
+            self._write(digest, payload, self._expiry(timeout))
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        digest = self._digest(key, version)
+        with self._locked():
+            payload = self._read(digest)
+            if payload is None:
+                return False
+            self._write(digest, payload, self._expiry(timeout))
+        return True
+
+    def delete(self, key, version=None):
+        digest = self._digest(key, version)
+        with self._locked():
+            if self._read(digest) is None:
+                return False
+            self._write(digest, b"", -1.0)
+        return True
+
+    def clear(self):
+        data = self._get_map()
+        with self._locked():
+            SEQUENCE.pack_into(data, GENERATION_OFFSET, self._generation(data) + 1)
+
+
+class _FileLock(object):
+    """Exclusive lock on the cache file, across threads and processes."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __enter__(self):
+        self.cache._get_map()
+        self.cache._lock.acquire()
+        fcntl.flock(self.cache._fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc_info):
+        fcntl.flock(self.cache._fd, fcntl.LOCK_UN)
+        self.cache._lock.release()
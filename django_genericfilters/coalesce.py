@@ -0,0 +1,80 @@
+"""
+Request coalescing: concurrent calls with the same key wait for a single
+computation and share its result.
+
+Within a process, followers wait for the thread computing the result.
+With a cache, a lock entry elects a single computing process and the
+result is shared through the cache for ``RESULT_TIMEOUT`` seconds.
+"""
+
+import threading
+import time
+
+RESULT_TIMEOUT = 1
+POLL_INTERVAL = 0.05
+
+_calls = {}
+_lock = threading.Lock()
+
+
+class _Call(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def single_flight(key, func, cache=None, timeout=10):
+    """
+    Return func(), sharing its result with concurrent calls for key.
+
+    Callers waiting more than timeout seconds compute the result
+    themselves.
+    """
+    with _lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+
+    if not leader:
+        if not call.event.wait(timeout):
+            return func()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        if cache is None:
+            call.result = func()
+        else:
+            call.result = shared_flight(key, func, cache, timeout)
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _lock:
+            del _calls[key]
+        call.event.set()
+    return call.result
+
+
+def shared_flight(key, func, cache, timeout=10):
+    """Return func(), computed by a single process of those sharing cache."""
+    result_key = key + ":result"
+    lock_key = key + ":lock"
+    deadline = time.monotonic() + timeout
+    while True:
+        result = cache.get(result_key)
+        if result is not None:
+            return result
+        if cache.add(lock_key, True, timeout):
+            try:
+                result = func()
+                cache.set(result_key, result, RESULT_TIMEOUT)
+                return result
+            finally:
+                cache.delete(lock_key)
+        if time.monotonic() > deadline:
+            return func()
+        time.sleep(POLL_INTERVAL)
@@ -0,0 +1,183 @@
+"""
+Facet counts of a whole table, maintained incrementally in a counter table.
+
+Add ``django_genericfilters.counters`` to ``INSTALLED_APPS``, run
+``migrate`` and register the counters of a model:
+
+.. code-block:: python
+
+    from django_genericfilters.counters import register_facet_counters
+
+    user_counters = register_facet_counters("users", User, ["is_active"])
+
+Counts are kept current by ``post_save`` and ``post_delete`` signals; the
+old values of fields deferred by ``only()`` or ``defer()`` are read before
+the save or delete.
+Writes that bypass signals (``QuerySet.update()``, ``bulk_create()``, raw
+SQL) are not seen: run the ``genericfilters_rebuild_counters`` management
+command to recompute them.
+"""
+
+import django
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+
+from django_genericfilters.facets import FacetCounts
+
+if django.VERSION < (3, 2):
+    default_app_config = "django_genericfilters.counters.apps.CountersConfig"
+
+registry = {}
+
+
+def counter_value(value):
+    """Return the value stored in the counter table for a field value."""
+    return str(getattr(value, "pk", value))
+
+
+class FacetCounters(object):
+    """
+    Count the rows of ``model`` for each value of ``fields``, in the
+    counters called ``name``.
+
+    Values are stored as strings, as returned by :func:`counter_value`.
+    """
+
+    def __init__(self, name, model, fields):
+        self.name = name
+        self.model = model
+        self.fields = tuple(fields)
+        self._attnames = {
+            field: model._meta.get_field(field).attname for field in self.fields
+        }
+        self._state = "_genericfilters_counters_%s" % name
+
+    def get_values(self, instance):
+        """Return the loaded {field: counter value} of instance."""
+        return {
+            field: counter_value(instance.__dict__[attname])
+            for field, attname in self._attnames.items()
+            if attname in instance.__dict__
+        }
+
+    def post_init(self, sender, instance, **kwargs):
+        instance.__dict__[self._state] = self.get_values(instance)
+
+    def load_old_values(self, instance, fields):
+        """Read from the database the old values of fields missing from the state."""
+        old = instance.__dict__.setdefault(self._state, {})
+        missing = {self._attnames[f]: f for f in fields if f not in old}
+        if not missing or instance.pk is None or instance._state.adding:
+            return
+        rows = self.model._base_manager.using(instance._state.db).filter(pk=instance.pk)
+        for attname, value in (rows.values(*missing).first() or {}).items():
+            old[missing[attname]] = counter_value(value)
+
+    def pre_save(self, sender, instance, **kwargs):
+        # Fields deferred by .only()/.defer() were loaded without old value.
+        self.load_old_values(instance, self.get_values(instance))
+
+    def pre_delete(self, sender, instance, **kwargs):
+        self.load_old_values(instance, self.fields)
+
+    def post_save(self, sender, instance, created, **kwargs):
+        old = {} if created else instance.__dict__.get(self._state, {})
+        new = self.get_values(instance)
+        deltas = []
+        for field, value in new.items():
+            if created:
+                deltas.append((field, value, 1))
+            elif field in old and old[field] != value:
+                deltas.append((field, old[field], -1))
+                deltas.append((field, value, 1))
+        self.apply(deltas)
+        instance.__dict__[self._state] = new
+
+    def post_delete(self, sender, instance, **kwargs):
+        values = self.get_values(instance)
+        values.update(instance.__dict__.get(self._state, {}))
+        self.apply([(field, value, -1) for field, value in values.items()])
+
+    def apply(self, deltas):
+        """Add delta to the counters of each (field, value, delta)."""
+        from .models import FacetCount
+
+        for field, value, delta in deltas:
+            counter = FacetCount.objects.filter(
+                name=self.name, field=field, value=value
+            )
+            if counter.update(count=F("count") + delta):
+                continue
+            try:
+                with transaction.atomic():
+                    FacetCount.objects.create(
+                        name=self.name, field=field, value=value, count=delta
+                    )
+            except IntegrityError:
+                counter.update(count=F("count") + delta)
+
+    def connect(self):
+        uid = "genericfilters_counters_%s" % self.name
+        post_init.connect(self.post_init, sender=self.model, dispatch_uid=uid)
+        pre_save.connect(self.pre_save, sender=self.model, dispatch_uid=uid)
+        post_save.connect(self.post_save, sender=self.model, dispatch_uid=uid)
+        pre_delete.connect(self.pre_delete, sender=self.model, dispatch_uid=uid)
+        post_delete.connect(self.post_delete, sender=self.model, dispatch_uid=uid)
+
+    def disconnect(self):
+        uid = "genericfilters_counters_%s" % self.name
+        post_init.disconnect(sender=self.model, dispatch_uid=uid)
+        pre_save.disconnect(sender=self.model, dispatch_uid=uid)
+        post_save.disconnect(sender=self.model, dispatch_uid=uid)
+        pre_delete.disconnect(sender=self.model, dispatch_uid=uid)
+        post_delete.disconnect(sender=self.model, dispatch_uid=uid)
+
+    def rebuild(self):
+        """Recompute every counter from the table. Return the number of counters."""
+        from .models import FacetCount
+
+        counters = []
+        for field, attname in self._attnames.items():
+            rows = self.model._base_manager.values_list(attname).annotate(
+                _count=Count("pk")
+            )
+            counters.extend(
+                FacetCount(
+                    name=self.name,
+                    field=field,
+                    value=counter_value(value),
+                    count=count,
+                )
+                for value, count in rows.order_by()
+            )
+        with transaction.atomic():
+            FacetCount.objects.filter(name=self.name).delete()
+            FacetCount.objects.bulk_create(counters)
+        return len(counters)
+
+    def counts(self, fields):
+        """Return {field: FacetCounts({counter value: count})} for fields."""
+        from .models import FacetCount
+
+        counts = {field: FacetCounts() for field in fields}
+        if not counts:
+            return counts
+        rows = FacetCount.objects.filter(name=self.name, field__in=fields)
+        for field, value, count in rows.values_list("field", "value", "count"):
+            counts[field][value] = count
+        return counts
+
+
+def register_facet_counters(name, model, fields):
+    """Maintain the facet counters of fields on model and return them."""
+    counters = FacetCounters(name, model, fields)
+    counters.connect()
+    registry[name] = counters
+    return counters
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class CountersConfig(AppConfig):
+    name = "django_genericfilters.counters"
+    label = "genericfilters_counters"
+    default_auto_field = "django.db.models.AutoField"
+    verbose_name = "Generic filters facet counters"
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from django_genericfilters.counters import registry
+
+
+class Command(BaseCommand):
+    help = "Recompute the facet counters registered with register_facet_counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help="counters names, all by default")
+
+    def handle(self, *args, **options):
+        unknown = set(options["names"]) - set(registry)
+        if unknown:
+            raise CommandError("Unknown counters: %s" % ", ".join(sorted(unknown)))
+        for name, counters in registry.items():
+            if options["names"] and name not in options["names"]:
+                continue
+            count = counters.rebuild()
+            self.stdout.write("%s: %d counters" % (name, count))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="FacetCount",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("field", models.CharField(max_length=100)),
+                ("value", models.CharField(max_length=255)),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "unique_together": {("name", "field", "value")},
+            },
+        ),
+    ]
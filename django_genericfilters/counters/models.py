@@ -0,0 +1,16 @@
+from django.db import models
+
+
+class FacetCount(models.Model):
+    """Number of rows having value for field, in the counters called name."""
+
+    name = models.CharField(max_length=100)
+    field = models.CharField(max_length=100)
+    value = models.CharField(max_length=255)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = [("name", "field", "value")]
+
+    def __str__(self):
+        return "%s.%s=%s: %d" % (self.name, self.field, self.value, self.count)
@@ -0,0 +1,122 @@
+"""
+Facet counts: the number of objects of a queryset for each value of a field.
+
+Counts are computed with one grouped query per field, either exactly or
+estimated from a sample of the rows for very large querysets.
+"""
+
+import random
+
+from django.db import connections
+from django.db.models import Count, Max, Min
+
+
+class FacetCounts(dict):
+    """A dict of value: count, with approximate set for estimates."""
+
+    approximate = False
+
+
+class FacetCounter(object):
+    """
+    Count the objects of ``queryset`` grouped by field values.
+
+    When ``sample_size`` is set, counts are estimated from about that many
+    rows: with ``TABLESAMPLE SYSTEM`` on PostgreSQL, or a random range of
+    primary keys elsewhere. Exact counts are used when the queryset is
+    small enough, or cannot be sampled.
+    """
+
+    def __init__(self, queryset, sample_size=None):
+        self.queryset = queryset.order_by()
+        self.sample_size = sample_size
+        self.connection = connections[queryset.db]
+
+    def group(self, queryset, lookup):
+        return queryset.values(lookup).annotate(_count=Count("pk")).order_by()
+
+    def count(self, lookup):
+        """Return the FacetCounts of lookup."""
+        if self.sample_size:
+            counts = self.sample(lookup)
+            if counts is not None and sum(counts.values()) > self.sample_size:
+                return counts
+        return self.exact(lookup)
+
+    def exact(self, lookup):
+        counts = FacetCounts()
+        for row in self.group(self.queryset, lookup):
+            counts[row[lookup]] = row["_count"]
+        return counts
+
+    def sample(self, lookup):
+        """Return estimated FacetCounts of lookup, or None."""
+        if self.connection.vendor == "postgresql":
+            counts = self.tablesample(lookup)
+            if counts is not None:
+                return counts
+        return self.pk_range_sample(lookup)
+
+    def estimate(self, rows, scale):
+        counts = FacetCounts()
+        counts.approximate = True
+        for row in rows:
+            counts[row[0]] = int(round(row[1] * scale))
+        return counts
+
+    def get_table_rows(self):
+        """Return the planner's estimate of the number of rows in the table."""
+        try:
+            return self._table_rows
+        except AttributeError:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                    [
+                        self.connection.ops.quote_name(
+                            self.queryset.model._meta.db_table
+                        )
+                    ],
+                )
+                row = cursor.fetchone()
+            self._table_rows = row[0] if row else -1
+            return self._table_rows
+
+    def tablesample(self, lookup):
+        table_rows = self.get_table_rows()
+        if table_rows <= self.sample_size:
+            return None
+
+        percent = 100.0 * self.sample_size / table_rows
+        sql, params = self.group(self.queryset, lookup).query.sql_with_params()
+        table = "FROM %s" % self.connection.ops.quote_name(
+            self.queryset.model._meta.db_table
+        )
+        if table not in sql:
+            return None
+        sql = sql.replace(table, "%s TABLESAMPLE SYSTEM (%.6f)" % (table, percent), 1)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return self.estimate(rows, 100.0 / percent)
+
+    def get_pk_range(self):
+        try:
+            return self._pk_range
+        except AttributeError:
+            self._pk_range = self.queryset.aggregate(low=Min("pk"), high=Max("pk"))
+            return self._pk_range
+
+    def pk_range_sample(self, lookup):
+        pk_range = self.get_pk_range()
+        low, high = pk_range["low"], pk_range["high"]
+        if not isinstance(low, int) or not isinstance(high, int):
+            return None
+        span = high - low + 1
+        if span <= self.sample_size:
+            return None
+
+        start = random.randint(low, high - self.sample_size + 1)
+        sample = self.queryset.filter(pk__gte=start, pk__lt=start + self.sample_size)
+        rows = self.group(sample, lookup).values_list(lookup, "_count")
+        return self.estimate(rows, float(span) / self.sample_size)
@@ -1,6 +1,19 @@
+import hashlib
+import uuid
+
 from django import forms
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db.models.signals import post_delete, post_save
 from django.utils.translation import gettext_lazy as _
 
+try:
+    from django.utils.choices import BaseChoiceIterator
+except ImportError:  # Django < 5.0
+    BaseChoiceIterator = object
+
+_derived_caches = {}
+
 
 class ChoiceField(forms.ChoiceField):
     def __init__(self, *args, **kwargs):
@@ -13,3 +26,164 @@ class ChoiceField(forms.ChoiceField):
                 ("no", _("No %(label)s") % {"label": kwargs.get("label", "")}),
             )
         super(ChoiceField, self).__init__(*args, **kwargs)
+
+
+def get_choices_version_key(model):
+    """Return the cache key of the version of the derived choices of model."""
+    return "genericfilters:choices:%s:version" % model._meta.label_lower
+
+
+def invalidate_derived_choices(sender, **kwargs):
+    """Expire the derived choices of sender, on post_save and post_delete."""
+    for alias in _derived_caches.get(sender, ()):
+        caches[alias].delete(get_choices_version_key(sender))
+
+
+class DerivedChoiceIterator(BaseChoiceIterator):
+    """Lazy choices of a DerivedChoiceField, read on iteration."""
+
+    def __init__(self, field):
+        self.field = field
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for value in self.field.get_values():
+            yield (value, self.field.label_from_value(value))
+
+    def __len__(self):
+        return len(self.field.get_values()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return True
+
+
+class DerivedChoiceField(forms.ChoiceField):
+    """
+    A ChoiceField whose choices are the distinct values of ``field`` among
+    the objects of ``queryset``.
+
+    Values are cached in the ``cache`` alias for ``timeout`` seconds, and
+    expire when an object of the model is saved or deleted. Writes that
+    bypass signals are only seen after timeout.
+
+    FilteredListView binds fields declared without ``queryset`` to its own
+    queryset, and without ``field`` to the lookup of the form field in
+    qs_filter_fields, or its name.
+    """
+
+    iterator = DerivedChoiceIterator
+
+    def __init__(
+        self,
+        field=None,
+        queryset=None,
+        cache="default",
+        timeout=300,
+        labels=None,
+        empty_label=_("All"),
+        **kwargs
+    ):
+        kwargs.setdefault("required", False)
+        forms.Field.__init__(self, **kwargs)
+        self.field_name = field
+        self.cache = cache
+        self.timeout = timeout
+        self.labels = labels
+        self.empty_label = empty_label
+        self.queryset = queryset
+
+    def __deepcopy__(self, memo):
+        result = super(forms.ChoiceField, self).__deepcopy__(memo)
+        result.__dict__.pop("_values", None)
+        result.queryset = None if self.queryset is None else self.queryset.all()
+        return result
+
+    def _get_queryset(self):
+        return self._queryset
+
+    def _set_queryset(self, queryset):
+        self._queryset = queryset
+        if queryset is not None:
+            aliases = _derived_caches.setdefault(queryset.model, set())
+            if self.cache not in aliases:
+                aliases.add(self.cache)
+                for signal in (post_save, post_delete):
+                    signal.connect(
+                        invalidate_derived_choices,
+                        sender=queryset.model,
+                        dispatch_uid="genericfilters_derived_choices",
+                    )
+        self.widget.choices = self.choices
+
+    queryset = property(_get_queryset, _set_queryset)
+
+    def _get_choices(self):
+        if hasattr(self, "_choices"):
+            return self._choices
+        return self.iterator(self)
+
+    choices = property(_get_choices, forms.ChoiceField.choices.fset)
+
+    def get_cache_key(self):
+        """Return the cache key of the values, or None if not cacheable."""
+        cache = caches[self.cache]
+        version_key = get_choices_version_key(self.queryset.model)
+        version = cache.get(version_key)
+        if version is None:
+            cache.add(version_key, uuid.uuid4().hex, None)
+            version = cache.get(version_key)
+        try:
+            sql = str(self.queryset.query)
+        except EmptyResultSet:
+            return None
+        digest = hashlib.md5(
+            ("%s:%s:%s" % (self.queryset.db, self.field_name, sql)).encode("utf-8")
+        ).hexdigest()
+        return "genericfilters:choices:%s:%s" % (version, digest)
+
+    def get_values(self):
+        """Return the sorted distinct values of field in queryset."""
+        if self.queryset is None or self.field_name is None:
+            return []
+        try:
+            return self._values
+        except AttributeError:
+            pass
+        key = self.get_cache_key()
+        values = None if key is None else caches[self.cache].get(key)
+        if values is None:
+            values = [
+                value
+                for value in self.queryset.order_by(self.field_name)
+                .values_list(self.field_name, flat=True)
+                .distinct()
+                if value not in (None, "")
+            ]
+            if key is not None:
+                caches[self.cache].set(key, values, self.timeout)
+        self._values = values
+        return values
+
+    def label_from_value(self, value):
+        """Return the label of value: from labels, the model field choices, or str()."""
+        labels = self.labels
+        if labels is None:
+            try:
+                model_field = self.queryset.model._meta.get_field(self.field_name)
+            except FieldDoesNotExist:
+                model_field = None
+            labels = dict(getattr(model_field, "flatchoices", None) or ())
+        return labels.get(value, str(value))
+
+    def to_python(self, value):
+        """Return the value of the column matching the submitted string."""
+        value = super(DerivedChoiceField, self).to_python(value)
+        for stored in self.get_values():
+            if str(stored) == value:
+                return stored
+        return value
+
+    def valid_value(self, value):
+        text_value = str(value)
+        return any(text_value == str(v) for v in self.get_values())
@@ -3,21 +3,59 @@ django generic filters implement a set of mixin to work with ordered
 and filtered queryset.
 
 """
+import re
+
 from django import forms
 from django.utils.translation import gettext_lazy as _
 
 from .fields import *  # NOQA
 
+QUERY_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def plan_query(query, max_terms=None, min_length=1):
+    """
+    Return the search terms of query: its words and "quoted phrases",
+    without duplicates (ignoring case) nor terms shorter than min_length,
+    and at most max_terms of them.
+    """
+    terms = []
+    seen = set()
+    for phrase, word in QUERY_TERM_RE.findall(query):
+        term = " ".join(phrase.split()) if phrase else word
+        if len(term) < min_length or term.casefold() in seen:
+            continue
+        seen.add(term.casefold())
+        terms.append(term)
+        if max_terms is not None and len(terms) >= max_terms:
+            break
+    return terms
+
 
 class QueryFormMixin(object):
     """
     Mixin implementing a query parameters for filtering results.
     """
 
+    query_max_terms = 10
+    query_min_length = 2
+
     def __init__(self, *args, **kwargs):
         super(QueryFormMixin, self).__init__(*args, **kwargs)
         self.fields["query"] = forms.CharField(required=False, widget=forms.HiddenInput)
 
+    def get_query_terms(self):
+        """
+        Return the search terms of the cleaned query, see plan_query():
+        at most query_max_terms terms of query_min_length characters or
+        more.
+        """
+        return plan_query(
+            self.cleaned_data.get("query") or "",
+            self.query_max_terms,
+            self.query_min_length,
+        )
+
 
 class OrderFormMixin(object):
     """
@@ -28,11 +66,19 @@ class OrderFormMixin(object):
     def __init__(self, *args, **kwargs):
         super(OrderFormMixin, self).__init__(*args, **kwargs)
 
+        choices = []
+        self.order_by_annotations = {}
+        for choice in self.get_order_by_choices():
+            if len(choice) > 2:
+                self.order_by_annotations[choice[0]] = choice[2]
+                choice = tuple(choice[:2])
+            choices.append(choice)
+
         self.fields["order_by"] = forms.ChoiceField(
             label=_("order by"),
             required=False,
             widget=forms.HiddenInput,
-            choices=self.get_order_by_choices(),
+            choices=choices,
         )
         self.fields["order_reverse"] = forms.BooleanField(
             label=_("order by"), required=False, widget=forms.HiddenInput
@@ -60,6 +106,17 @@ class OrderFormMixin(object):
             def get_order_by_choices(self):
                 return [("1", "choice1"),
                         ("2", "choice2")]
+
+        A choice may have a third item, a dict of annotations required to
+        order by its value. They are only added to the queryset when that
+        order is selected, and are left out of the COUNT query:
+
+        .. code-block:: python
+
+            def get_order_by_choices(self):
+                return [("name", "Name"),
+                        ("num_groups", "Groups",
+                         {"num_groups": Count("groups")})]
         """
 
         raise NotImplementedError(_("Don't forget to implements get_order_by_choices"))
@@ -0,0 +1,31 @@
+"""
+Lookups registered by django_genericfilters on every model field.
+"""
+
+from django.db.models.lookups import In
+
+
+class AnyIn(In):
+    """
+    ``IN`` lookup sending its values as one array parameter on PostgreSQL.
+
+    ``field__genericfilters_any=[...]`` compiles to ``field = ANY(%s::type[])``
+    so the SQL text (and the prepared statement) does not grow with the
+    number of values. Other backends use a regular ``IN`` clause, which
+    Django already splits on backends limiting its size.
+    """
+
+    lookup_name = "genericfilters_any"
+
+    def as_postgresql(self, compiler, connection):
+        if self.rhs_is_direct_value():
+            lhs, lhs_params = self.process_lhs(compiler, connection)
+            field = self.lhs.output_field
+            values = [
+                field.get_db_prep_value(value, connection, prepared=True)
+                for value in self.rhs
+                if value is not None
+            ]
+            sql = "%s = ANY(%%s::%s[])" % (lhs, field.cast_db_type(connection))
+            return sql, tuple(lhs_params) + (values,)
+        return self.as_sql(compiler, connection)
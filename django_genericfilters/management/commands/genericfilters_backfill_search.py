@@ -0,0 +1,22 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from django_genericfilters.search import registry
+
+
+class Command(BaseCommand):
+    help = "Recompute the search columns registered with register_search_column."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models", nargs="*", help="app_label.ModelName, all models by default"
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        models = [apps.get_model(label) for label in options["models"]]
+        for model, search_column in registry.items():
+            if models and model not in models:
+                continue
+            count = search_column.backfill(batch_size=options["batch_size"])
+            self.stdout.write("%s: %d rows" % (model._meta.label, count))
@@ -0,0 +1,45 @@
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from django_genericfilters.views import get_filtered_list_views
+
+
+class Command(BaseCommand):
+    help = "Materialize the saved_searches of the FilteredListView URLs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names", nargs="*", help="saved search names, all by default"
+        )
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        warned = set()
+        for path, view_class in get_filtered_list_views():
+            alias = view_class.saved_search_cache
+            if view_class.saved_searches and alias not in warned:
+                warned.add(alias)
+                self.check_cache(alias)
+            for name in view_class.saved_searches or {}:
+                if options["names"] and name not in options["names"]:
+                    continue
+                request = factory.get(path, {view_class.saved_search_param: name})
+                view = view_class()
+                view.setup(request)
+                count = view.refresh_saved_search(name)
+                self.stdout.write("%s %s: %d objects" % (path, name, count))
+
+    def check_cache(self, alias):
+        """Warn when the cache alias is not shared with other processes."""
+        if isinstance(caches[alias], (LocMemCache, DummyCache)):
+            self.stderr.write(
+                self.style.WARNING(
+                    "The %r cache is local to this process: web servers will "
+                    "not see the refreshed saved searches. Use a cache shared "
+                    "by every process, such as a database, file, memcached or "
+                    "redis cache." % alias
+                )
+            )
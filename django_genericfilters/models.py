@@ -1 +1,7 @@
-"""Must be kept even empty. That makes a Django app."""
+from django.db.models import Field, ForeignObject
+
+from .lookups import AnyIn
+
+# Related fields do not inherit the lookups registered on Field.
+Field.register_lookup(AnyIn)
+ForeignObject.register_lookup(AnyIn)
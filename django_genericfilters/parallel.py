@@ -0,0 +1,53 @@
+"""
+Run independent queries of a request on a bounded thread pool.
+
+Each thread uses its own database connection, closed or kept according to
+CONN_MAX_AGE once the query is done.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+_executors = {}
+_lock = threading.Lock()
+
+
+def get_executor(max_workers):
+    """Return the process wide executor with max_workers threads."""
+    with _lock:
+        try:
+            return _executors[max_workers]
+        except KeyError:
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="genericfilters"
+            )
+            _executors[max_workers] = executor
+            return executor
+
+
+def can_run_in_threads(connection):
+    """
+    Return True if the queries of connection can run in other threads:
+    outside of a transaction, which other connections would not see, and
+    not on an in-memory database.
+    """
+    is_in_memory_db = getattr(connection, "is_in_memory_db", lambda: False)
+    return not connection.in_atomic_block and not is_in_memory_db()
+
+
+def call(func):
+    try:
+        return func()
+    finally:
+        close_old_connections()
+
+
+def run_in_threads(tasks, max_workers):
+    """
+    Run a dict of name: callable concurrently and return a dict of
+    name: result. Exceptions are raised once every task is done.
+    """
+    executor = get_executor(max_workers)
+    futures = {name: executor.submit(call, func) for name, func in tasks.items()}
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,100 @@
+"""
+Per-request memory profiling of FilteredListView with tracemalloc.
+"""
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+# Tracing is global to the process: it is started by the first active
+# profile, unless already on, and stopped with the last one.
+_lock = threading.Lock()
+_active = 0
+_owned = False
+
+
+def format_size(size):
+    """Return a human readable signed size in KiB."""
+    return "%.1fKiB" % (size / 1024.0)
+
+
+class MemoryProfile(object):
+    """
+    Record the allocations of named phases of a request.
+
+    For each phase, ``net`` is the memory still allocated at its end,
+    ``peak`` the highest allocation during it (both relative to its start,
+    in bytes), and ``top`` the ``top`` source lines which allocated the
+    most memory.
+
+    Allocations are traced for the whole process: the phases of concurrent
+    profiles, in other threads, include the allocations of each other.
+    """
+
+    def __init__(self, top=10):
+        self.top = top
+        self.phases = []
+        self._started = False
+
+    def start(self):
+        global _active, _owned
+        if self._started:
+            return
+        with _lock:
+            if not _active and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _owned = True
+            _active += 1
+        self._started = True
+
+    def stop(self):
+        global _active, _owned
+        if not self._started:
+            return
+        with _lock:
+            _active -= 1
+            if not _active and _owned:
+                tracemalloc.stop()
+                _owned = False
+        self._started = False
+
+    @contextmanager
+    def phase(self, name):
+        before = tracemalloc.take_snapshot()
+        if hasattr(tracemalloc, "reset_peak"):  # Python >= 3.9
+            tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            end, peak = tracemalloc.get_traced_memory()
+            stats = tracemalloc.take_snapshot().compare_to(before, "lineno")
+            self.phases.append(
+                {
+                    "name": name,
+                    "net": end - start,
+                    "peak": max(peak - start, 0),
+                    "top": [
+                        (str(stat.traceback[0]), stat.size_diff)
+                        for stat in stats[: self.top]
+                    ],
+                }
+            )
+
+    def summary(self):
+        """Return a one line summary: name=net/peak for each phase."""
+        return ";".join(
+            "%s=%s/%s" % (p["name"], format_size(p["net"]), format_size(p["peak"]))
+            for p in self.phases
+        )
+
+    def report(self):
+        """Return a multiline report including the top allocation sites."""
+        lines = []
+        for p in self.phases:
+            lines.append(
+                "%s: net %s, peak %s"
+                % (p["name"], format_size(p["net"]), format_size(p["peak"]))
+            )
+            for site, size in p["top"]:
+                lines.append("    %s %s" % (format_size(size), site))
+        return "\n".join(lines)
@@ -0,0 +1,83 @@
+"""
+Materialized saved searches.
+
+The primary keys matching a named filter state of a FilteredListView are
+stored in a cache entry as a compressed array, so that opening the saved
+search only fetches the rows of the requested page.
+"""
+
+import time
+import zlib
+from array import array
+
+
+def get_saved_search_key(view_class, name):
+    """Return the cache key of the saved search name of view_class."""
+    return "genericfilters:saved:%s.%s:%s" % (
+        view_class.__module__,
+        view_class.__qualname__,
+        name,
+    )
+
+
+def encode_pks(pks):
+    """Return pks as compressed 64 bits integers, or as a list."""
+    try:
+        data = array("q", pks)
+    except (TypeError, OverflowError):
+        return list(pks)
+    return zlib.compress(data.tobytes())
+
+
+def decode_pks(value):
+    """Return the sequence of pks encoded by encode_pks()."""
+    if not isinstance(value, bytes):
+        return value
+    data = array("q")
+    data.frombytes(zlib.decompress(value))
+    return data
+
+
+def make_entry(pks):
+    """Return the cache entry of a saved search matching pks."""
+    return {"pks": encode_pks(pks), "count": len(pks), "refreshed": time.time()}
+
+
+class MaterializedResults(object):
+    """
+    Sequence of the objects of ``queryset`` whose primary key is in
+    ``pks``, in the order of ``pks``.
+
+    Slicing only fetches the objects of the slice, so that a paginator
+    never reads the whole list. Objects deleted since the saved search was
+    refreshed are left out.
+    """
+
+    batch_size = 1000
+
+    def __init__(self, queryset, pks):
+        self.queryset = queryset
+        self.pks = pks
+
+    def count(self):
+        return len(self.pks)
+
+    def __len__(self):
+        return len(self.pks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.fetch(self.pks[index])
+        objects = self.fetch([self.pks[index]])
+        if not objects:
+            raise IndexError(index)
+        return objects[0]
+
+    def __iter__(self):
+        for start in range(0, len(self.pks), self.batch_size):
+            for obj in self.fetch(self.pks[start : start + self.batch_size]):
+                yield obj
+
+    def fetch(self, pks):
+        objects = self.queryset.in_bulk(list(pks))
+        return [objects[pk] for pk in pks if pk in objects]
@@ -0,0 +1,125 @@
+"""
+Maintained denormalized search column for search_fields.
+
+A search column holds the normalized (lowercased, unaccented)
+concatenation of the searched fields of a model, so that each searched
+word is matched against a single column which can carry one trigram or
+full-text index.
+
+.. code-block:: python
+
+    from django_genericfilters.search import register_search_column
+
+    register_search_column(User, ['first_name', 'last_name', 'email'])
+
+"""
+
+import unicodedata
+
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import post_save, pre_save
+
+registry = {}
+
+
+def normalize(text):
+    """Return text lowercased and without accents."""
+    text = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+class SearchColumn(object):
+    """
+    Keep ``column`` of ``model`` filled with its normalized ``fields``.
+
+    Fields may follow single-valued relations (``author__name``). Changes
+    of related objects are not tracked: run the
+    ``genericfilters_backfill_search`` management command to refresh
+    existing rows.
+    """
+
+    separator = " "
+
+    def __init__(self, model, fields, column="search_text"):
+        self.model = model
+        self.fields = tuple(fields)
+        self.column = column
+
+    def get_value(self, instance):
+        """Return the search column value of instance."""
+        values = []
+        for field in self.fields:
+            value = instance
+            for name in field.split(LOOKUP_SEP):
+                value = getattr(value, name, None)
+                if value is None:
+                    break
+            if value is not None:
+                values.append(normalize(value))
+        return self.separator.join(values)
+
+    def get_related(self):
+        """Return the relations to select when computing many values."""
+        return [
+            LOOKUP_SEP.join(field.split(LOOKUP_SEP)[:-1])
+            for field in self.fields
+            if LOOKUP_SEP in field
+        ]
+
+    def pre_save(self, sender, instance, **kwargs):
+        setattr(instance, self.column, self.get_value(instance))
+
+    def post_save(self, sender, instance, update_fields=None, **kwargs):
+        # pre_save cannot add the column to an explicit update_fields.
+        if update_fields is None or self.column in update_fields:
+            return
+        searched = {field.split(LOOKUP_SEP)[0] for field in self.fields}
+        if searched.intersection(update_fields):
+            sender._base_manager.filter(pk=instance.pk).update(
+                **{self.column: getattr(instance, self.column)}
+            )
+
+    def connect(self):
+        uid = "genericfilters_search_%s" % self.model._meta.label
+        pre_save.connect(self.pre_save, sender=self.model, dispatch_uid=uid)
+        post_save.connect(self.post_save, sender=self.model, dispatch_uid=uid)
+
+    def disconnect(self):
+        uid = "genericfilters_search_%s" % self.model._meta.label
+        pre_save.disconnect(sender=self.model, dispatch_uid=uid)
+        post_save.disconnect(sender=self.model, dispatch_uid=uid)
+
+    def backfill(self, batch_size=1000, queryset=None):
+        """
+        Recompute the column of every row, or of those of queryset. Return
+        the number of rows.
+        """
+        if queryset is None:
+            queryset = self.model._base_manager.all()
+        queryset = queryset.order_by("pk")
+        related = self.get_related()
+        if related:
+            queryset = queryset.select_related(*related)
+
+        count = 0
+        last_pk = None
+        while True:
+            batch = queryset
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            batch = list(batch[:batch_size])
+            if not batch:
+                return count
+            for instance in batch:
+                setattr(instance, self.column, self.get_value(instance))
+            self.model._base_manager.bulk_update(batch, [self.column])
+            count += len(batch)
+            last_pk = batch[-1].pk
+
+
+def register_search_column(model, fields, column="search_text"):
+    """Maintain a search column of fields on model and return it."""
+    search_column = SearchColumn(model, fields, column)
+    search_column.connect()
+    registry[model] = search_column
+    return search_column
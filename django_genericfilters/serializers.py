@@ -0,0 +1,30 @@
+"""
+JSON serialization of filtered lists.
+
+orjson is used when it is installed (``pip install
+django-generic-filters[json]``), the standard library otherwise.
+"""
+
+import json
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def default(obj):
+    """Serialize objects orjson does not know about."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    return DjangoJSONEncoder().default(obj)
+
+
+def dumps(data):
+    """Return data serialized as JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, default=default)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
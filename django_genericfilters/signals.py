@@ -0,0 +1,10 @@
+from django.dispatch import Signal
+
+#: Sent by FilteredListView with memory_profile set, once the response is
+#: rendered. Arguments: ``view`` and ``profile`` (a MemoryProfile).
+memory_profiled = Signal()
+
+#: Sent by FilteredListView after each chunk of a bulk action. Arguments:
+#: ``view``, ``action`` (its name), ``done`` and ``total`` (numbers of
+#: objects).
+bulk_action_progress = Signal()
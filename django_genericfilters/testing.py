@@ -0,0 +1,50 @@
+"""
+Test helpers for FilteredListView.
+"""
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from .budgets import QueryBudgetExceeded, format_budget_error
+from .views import get_filtered_list_views
+
+
+class QueryBudgetTestMixin(object):
+    """
+    TestCase mixin checking the query_budget of FilteredListView URLs.
+
+    ``test_query_budgets`` requests every FilteredListView of the URLconf
+    declaring a query_budget, as HTML, and as JSON when it has
+    json_fields. Use fixtures or setUpTestData so that the lists are not
+    empty.
+    """
+
+    query_budget_urlconf = None
+    query_budget_data = {}
+
+    def assertQueryBudget(self, path, budget, data=None, **extra):
+        """Assert that requesting path runs at most budget queries."""
+        with CaptureQueriesContext(connections["default"]) as queries:
+            response = self.client.get(path, data or {}, **extra)
+        self.assertLess(response.status_code, 400, path)
+        if len(queries) > budget:
+            raise QueryBudgetExceeded(
+                format_budget_error(path, budget, queries.captured_queries)
+            )
+
+    def test_query_budgets(self):
+        for path, view_class in get_filtered_list_views(self.query_budget_urlconf):
+            budget = view_class.query_budget
+            if budget is None:
+                continue
+            if not isinstance(budget, dict):
+                budget = {"html": budget, "json": budget}
+            data = self.query_budget_data.get(path, {})
+
+            with self.subTest(path=path, kind="html"):
+                if budget.get("html") is not None:
+                    self.assertQueryBudget(path, budget["html"], data)
+
+            with self.subTest(path=path, kind="json"):
+                if view_class.json_fields and budget.get("json") is not None:
+                    json_data = dict(data, **{view_class.json_format_param: "json"})
+                    self.assertQueryBudget(path, budget["json"], json_data)
@@ -0,0 +1,169 @@
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+
+from django_genericfilters import views
+from django_genericfilters.bitmaps import BitmapIndex, bit_count, iter_bits
+from django_genericfilters.tests import test_views
+from django_genericfilters.tests.test_views import People, Something, Status, setup_view
+
+
+class BitmapTestCase(TestCase):
+    def test_bits(self):
+        bitmap = (1 << 3) | (1 << 10) | (1 << 200)
+        self.assertEqual([3, 10, 200], list(iter_bits(bitmap)))
+        self.assertEqual(3, bit_count(bitmap))
+        self.assertEqual([], list(iter_bits(0)))
+        self.assertEqual(list(range(7, 20)), list(iter_bits(((1 << 13) - 1) << 7)))
+
+    def test_bits__large(self):
+        bitmap = sum(1 << (50000000 - i * 997) for i in range(1000))
+        pks = list(iter_bits(bitmap))
+        self.assertEqual(1000, len(pks))
+        self.assertEqual(50000000 - 999 * 997, pks[0])
+        self.assertEqual(50000000, pks[-1])
+
+
+class BitmapIndexTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.people = People.objects.create(name="fake")
+        cls.stateA = Status.objects.create(name="stateA")
+        cls.stateB = Status.objects.create(name="stateB")
+        cls.A = Something.objects.create(city="N", people=cls.people, status=cls.stateA)
+        cls.B = Something.objects.create(city="N", people=cls.people, status=cls.stateB)
+        cls.C = Something.objects.create(city="P", people=cls.people, status=cls.stateB)
+
+    def setUp(self):
+        self.index = BitmapIndex(Something, ["city", "status"])
+        self.index.connect()
+        self.addCleanup(self.index.disconnect)
+
+    def test_count(self):
+        self.assertEqual(3, self.index.count({}))
+        self.assertEqual(2, self.index.count({"city": "N"}))
+        self.assertEqual(1, self.index.count({"city": "N", "status": self.stateB}))
+        self.assertEqual(0, self.index.count({"city": "X"}))
+
+    def test_pks(self):
+        self.assertEqual(
+            [self.B.pk, self.C.pk], self.index.pks({"status": self.stateB.pk})
+        )
+
+    def test_covers(self):
+        self.assertTrue(self.index.covers({"city": "N"}))
+        self.assertFalse(self.index.covers({"country": "F"}))
+        self.assertFalse(self.index.covers({"city": ["N", "P"]}))
+
+    def test_facet(self):
+        self.assertEqual(
+            {"N": 1, "P": 1}, self.index.facet("city", {"status": self.stateB})
+        )
+
+    def test_signals(self):
+        self.index.build()
+        D = Something.objects.create(city="P", people=self.people, status=None)
+        self.assertEqual(2, self.index.count({"city": "P"}))
+
+        D.city = "N"
+        D.save()
+        self.assertEqual(1, self.index.count({"city": "P"}))
+        self.assertEqual(3, self.index.count({"city": "N"}))
+
+        D.delete()
+        self.assertEqual(2, self.index.count({"city": "N"}))
+
+    def test_signals__previous_value(self):
+        class Bitmaps(dict):
+            def __setitem__(self, key, value):
+                written.append(key)
+                super(Bitmaps, self).__setitem__(key, value)
+
+        written = []
+        self.index.build()
+        for name in self.index.fields:
+            self.index._bitmaps[name] = Bitmaps(self.index._bitmaps[name])
+        A = Something.objects.get(pk=self.A.pk)
+        A.city = "P"
+        A.save()
+        # Only the bitmaps of the previous and new values are written.
+        self.assertEqual(["N", "P"], written)
+        self.assertEqual(2, self.index.count({"city": "P"}))
+        self.assertEqual(1, self.index.count({"city": "N"}))
+
+        B = Something.objects.only("pk").get(pk=self.B.pk)
+        B.status = self.stateA
+        B.save()
+        self.assertEqual(2, self.index.count({"status": self.stateA.pk}))
+        self.assertEqual(1, self.index.count({"status": self.stateB.pk}))
+
+    def test_filtered_list_view(self):
+        view = setup_view(
+            views.FilteredListView(
+                queryset=Something.objects.order_by("pk"),
+                form_class=test_views.FilteredViewTestCase.Form,
+                filter_fields=["city"],
+                filter_index=self.index,
+                paginate_by=10,
+            ),
+            RequestFactory().get("/fake", {"city": "N"}),
+        )
+        view.object_list = view.get_queryset()
+        self.assertIn(
+            "IN (%s, %s)" % (self.A.pk, self.B.pk), str(view.object_list.query)
+        )
+
+        with self.assertNumQueries(1):
+            context = view.get_context_data()
+            self.assertEqual(2, context["paginator"].count)
+            self.assertEqual([self.A, self.B], list(context["object_list"]))
+
+        counts = {c.value: c.count for c in context["filters"][0].choices[1:]}
+        self.assertEqual({"N": 2, "P": 1}, counts)
+
+    def test_filtered_list_view__stale_index(self):
+        self.index.build()
+        Something.objects.filter(pk=self.A.pk).update(city="P")
+        view = setup_view(
+            views.FilteredListView(
+                queryset=Something.objects.order_by("pk"),
+                form_class=test_views.FilteredViewTestCase.Form,
+                filter_fields=["city"],
+                filter_index=self.index,
+            ),
+            RequestFactory().get("/fake", {"city": "N"}),
+        )
+        self.assertEqual([self.B], list(view.get_queryset()))
+
+    def test_ttl(self):
+        self.index.ttl = 0
+        self.index.build()
+        Something.objects.filter(pk=self.A.pk).update(city="P")
+        self.assertEqual(2, self.index.count({"city": "P"}))
+
+    def test_bulk_action(self):
+        view = views.FilteredListView.as_view(
+            model=Something,
+            form_class=test_views.FilteredViewTestCase.Form,
+            filter_index=self.index,
+            bulk_actions={"paris": {"city": "P"}},
+        )
+        self.index.build()
+        request = RequestFactory().post("/fake", {"bulk_action": "paris"})
+        request.user = User(is_superuser=True)
+        view(request)
+        self.assertEqual(3, self.index.count({"city": "P"}))
+
+    def test_filtered_list_view__not_covered(self):
+        view = setup_view(
+            views.FilteredListView(
+                model=Something,
+                form_class=test_views.FilteredViewTestCase.Form,
+                filter_fields=["country"],
+                filter_index=self.index,
+                paginate_by=10,
+            ),
+            RequestFactory().get("/fake", {"country": "F"}),
+        )
+        view.object_list = view.get_queryset()
+        self.assertIsNone(view.get_result_count(view.object_list))
+        self.assertEqual({}, view.get_facet_counts())
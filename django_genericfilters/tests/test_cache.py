@@ -0,0 +1,177 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from django_genericfilters import views
+from django_genericfilters.cache import MmapCache
+from django_genericfilters.tests import test_views
+from django_genericfilters.tests.test_views import (
+    Something,
+    SomethingFactory,
+    setup_view,
+)
+
+
+class MmapCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "cache")
+        self.cache = self.get_cache()
+
+    def get_cache(self, **options):
+        options.setdefault("SLOTS", 64)
+        options.setdefault("SLOT_SIZE", 256)
+        return MmapCache(self.path, {"OPTIONS": options})
+
+    def test_set_get(self):
+        self.cache.set("key", {"count": 42})
+        self.assertEqual({"count": 42}, self.cache.get("key"))
+        self.assertIsNone(self.cache.get("other"))
+        self.assertEqual(1, self.cache.get("key", version=2, default=1))
+
+    def test_shared(self):
+        self.cache.set("key", [1, 2, 3])
+        other = self.get_cache()
+        self.assertEqual([1, 2, 3], other.get("key"))
+        other.set("key", [4])
+        self.assertEqual([4], self.cache.get("key"))
+
+    def test_fork(self):
+        self.cache.set("key", "parent")
+        pid = os.fork()
+        if pid == 0:
+            self.cache.set("key", "child")
+            os._exit(0)
+        os.waitpid(pid, 0)
+        self.assertEqual("child", self.cache.get("key"))
+
+    def test_too_large(self):
+        self.cache.set("key", "x" * 1000)
+        self.assertIsNone(self.cache.get("key"))
+        self.cache.set("key", 1)
+        self.cache.set("key", "x" * 1000)
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_add_delete(self):
+        self.assertTrue(self.cache.add("key", 1))
+        self.assertFalse(self.cache.add("key", 2))
+        self.assertEqual(1, self.cache.get("key"))
+        self.assertTrue(self.cache.delete("key"))
+        self.assertFalse(self.cache.delete("key"))
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_timeout(self):
+        self.cache.set("key", 1, timeout=0.01)
+        self.cache.set("forever", 1, timeout=None)
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.get("key"))
+        self.assertEqual(1, self.cache.get("forever"))
+        self.assertTrue(self.cache.touch("forever", timeout=0.01))
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.get("forever"))
+
+    def test_clear(self):
+        self.cache.set("key", 1)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("key"))
+        self.cache.set("key", 2)
+        self.assertEqual(2, self.cache.get("key"))
+
+    def test_layout_change(self):
+        self.cache.set("key", 1)
+        cache = self.get_cache(SLOTS=32)
+        self.assertIsNone(cache.get("key"))
+        # The previous file is replaced, not truncated under its mappings.
+        self.assertEqual(1, self.cache.get("key"))
+        self.assertEqual(
+            [],
+            [f for f in os.listdir(os.path.dirname(self.path)) if f.endswith(".tmp")],
+        )
+
+
+class MetadataCacheTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SomethingFactory.create_batch(12)
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        backend = "django_genericfilters.cache.MmapCache"
+        location = os.path.join(directory, "cache")
+        settings = override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "genericfilters": {"BACKEND": backend, "LOCATION": location},
+            }
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def get_context(self, **kwargs):
+        view = setup_view(
+            views.FilteredListView(
+                model=Something,
+                form_class=test_views.FilteredViewTestCase.Form,
+                filter_fields=["city", "parent"],
+                qs_filter_fields={"city": "city", "people": "parent"},
+                default_order="city",
+                paginate_by=5,
+                facet_counts="exact",
+                metadata_cache="genericfilters",
+                **kwargs
+            ),
+            RequestFactory().get("/fake", {"page": 2}),
+        )
+        view.object_list = view.get_queryset()
+        return view.get_context_data()
+
+    def test_metadata_cache(self):
+        with self.assertNumQueries(5):
+            # count, rows, parent choices and facets for city and parent
+            context = self.get_context()
+            self.assertEqual(12, context["paginator"].count)
+            self.assertEqual(5, len(context["object_list"]))
+        counts = [[c.get("count") for c in f.choices] for f in context["filters"]]
+
+        with self.assertNumQueries(1):
+            context = self.get_context()
+            self.assertEqual(12, context["paginator"].count)
+            self.assertEqual(5, len(context["object_list"]))
+            self.assertEqual(13, len(context["filters"][1].choices))
+            self.assertEqual(
+                counts,
+                [[c.get("count") for c in f.choices] for f in context["filters"]],
+            )
+
+    def test_stale_count(self):
+        now = time.time()
+        with mock.patch("time.time", return_value=now):
+            context = self.get_context(count_stale_after=10)
+            self.assertEqual(12, context["paginator"].count)
+            self.assertFalse(context["count_is_stale"])
+
+        SomethingFactory()
+        with mock.patch("time.time", return_value=now + 11):
+            with self.assertNumQueries(1):
+                # The stale count is served, then recomputed.
+                context = self.get_context(count_stale_after=10)
+                self.assertEqual(12, context["paginator"].count)
+            self.assertTrue(context["count_is_stale"])
+
+            context = self.get_context(count_stale_after=10)
+            self.assertEqual(13, context["paginator"].count)
+            self.assertFalse(context["count_is_stale"])
+
+    def test_stale_count__single_flight(self):
+        self.get_context(count_stale_after=0)
+        with mock.patch.object(caches["genericfilters"], "add", return_value=False):
+            with self.assertNumQueries(0):
+                context = self.get_context(count_stale_after=0)
+                self.assertEqual(12, context["paginator"].count)
@@ -0,0 +1,105 @@
+import threading
+
+from django.core.cache import caches
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from django_genericfilters import coalesce, views
+from django_genericfilters.tests import test_views
+from django_genericfilters.tests.test_views import (
+    Something,
+    SomethingFactory,
+    setup_view,
+)
+
+
+class SingleFlightTestCase(SimpleTestCase):
+    def setUp(self):
+        self.cache = caches["default"]
+        self.cache.clear()
+
+    def test_single_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "result"
+
+        results = []
+
+        def request():
+            results.append(coalesce.single_flight("key", func))
+
+        leader = threading.Thread(target=request)
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=request) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(["result"] * 5, results)
+
+    def test_error(self):
+        def func():
+            raise ValueError("fail")
+
+        with self.assertRaises(ValueError):
+            coalesce.single_flight("key", func)
+
+    def test_shared_flight(self):
+        self.assertEqual(1, coalesce.shared_flight("key", lambda: 1, self.cache))
+        self.assertEqual(1, coalesce.shared_flight("key", lambda: 2, self.cache))
+        self.assertIsNone(self.cache.get("key:lock"))
+
+    def test_shared_flight__wait(self):
+        self.cache.add("key:lock", True)
+        timer = threading.Timer(0.1, self.cache.set, ["key:result", 1])
+        timer.start()
+        self.addCleanup(timer.cancel)
+        self.assertEqual(1, coalesce.shared_flight("key", lambda: 2, self.cache))
+
+        self.cache.delete("key:result")
+        self.assertEqual(3, coalesce.shared_flight("key", lambda: 3, self.cache, 0))
+
+
+class CoalesceRequestsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SomethingFactory.create_batch(12)
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def get_context(self):
+        view = setup_view(
+            views.FilteredListView(
+                model=Something,
+                form_class=test_views.FilteredViewTestCase.Form,
+                default_order="city",
+                paginate_by=5,
+                coalesce_requests=True,
+                coalesce_cache="default",
+            ),
+            RequestFactory().get("/fake", {"page": 2}),
+        )
+        view.object_list = view.get_queryset()
+        context = view.get_context_data()
+        return context, list(context["object_list"])
+
+    def test_coalesce_requests(self):
+        with self.assertNumQueries(2):
+            context, rows = self.get_context()
+        self.assertEqual(12, context["paginator"].count)
+        self.assertEqual(list(Something.objects.order_by("city")[5:10]), rows)
+
+        with self.assertNumQueries(0):
+            context, shared_rows = self.get_context()
+        self.assertEqual(12, context["paginator"].count)
+        self.assertEqual(rows, shared_rows)
@@ -0,0 +1,126 @@
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+
+from django_genericfilters import views
+from django_genericfilters.counters import FacetCounters, registry
+from django_genericfilters.counters.models import FacetCount
+from django_genericfilters.tests import test_views
+from django_genericfilters.tests.test_views import (
+    People,
+    Something,
+    Status,
+    setup_view,
+)
+
+
+class FacetCountersTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.people = People.objects.create(name="fake")
+        cls.stateA = Status.objects.create(name="stateA")
+        cls.stateB = Status.objects.create(name="stateB")
+
+    def setUp(self):
+        self.counters = FacetCounters("something", Something, ["city", "status"])
+        self.counters.connect()
+        self.addCleanup(self.counters.disconnect)
+
+    def create(self, city, status):
+        return Something.objects.create(city=city, people=self.people, status=status)
+
+    def assertCounts(self, expected):
+        counts = self.counters.counts(["city", "status"])
+        self.assertEqual(
+            expected, {f: {k: v for k, v in c.items() if v} for f, c in counts.items()}
+        )
+
+    def test_signals(self):
+        A = self.create("N", self.stateA)
+        self.create("N", self.stateB)
+        self.assertCounts(
+            {
+                "city": {"N": 2},
+                "status": {str(self.stateA.pk): 1, str(self.stateB.pk): 1},
+            }
+        )
+
+        A = Something.objects.get(pk=A.pk)
+        A.city = "P"
+        A.status = None
+        A.save()
+        self.assertCounts(
+            {
+                "city": {"N": 1, "P": 1},
+                "status": {"None": 1, str(self.stateB.pk): 1},
+            }
+        )
+
+        A.delete()
+        self.assertCounts({"city": {"N": 1}, "status": {str(self.stateB.pk): 1}})
+
+    def test_deferred_fields(self):
+        A = self.create("N", self.stateA)
+        self.create("N", self.stateB)
+
+        A = Something.objects.only("pk").get(pk=A.pk)
+        A.city = "P"
+        A.save()
+        self.assertCounts(
+            {
+                "city": {"N": 1, "P": 1},
+                "status": {str(self.stateA.pk): 1, str(self.stateB.pk): 1},
+            }
+        )
+
+        Something.objects.only("pk").get(pk=A.pk).delete()
+        self.assertCounts({"city": {"N": 1}, "status": {str(self.stateB.pk): 1}})
+
+    def test_rebuild(self):
+        self.counters.disconnect()
+        self.create("N", self.stateA)
+        self.create("P", self.stateA)
+        self.assertCounts({"city": {}, "status": {}})
+
+        out = StringIO()
+        with mock.patch.dict(registry, {"something": self.counters}, clear=True):
+            call_command("genericfilters_rebuild_counters", stdout=out)
+        self.assertIn("something: 3 counters", out.getvalue())
+        self.assertCounts(
+            {"city": {"N": 1, "P": 1}, "status": {str(self.stateA.pk): 2}}
+        )
+        self.assertEqual(3, FacetCount.objects.count())
+
+    def test_filtered_list_view(self):
+        self.create("N", self.stateA)
+        self.create("P", self.stateA)
+
+        def get_filters(data):
+            view = setup_view(
+                views.FilteredListView(
+                    model=Something,
+                    form_class=test_views.FilteredViewTestCase.Form,
+                    filter_fields=["city"],
+                    facet_counters=self.counters,
+                ),
+                RequestFactory().get("/fake", data),
+            )
+            view.object_list = view.get_queryset()
+            return view.get_filters()
+
+        with self.assertNumQueries(1):
+            filters = get_filters({})
+        self.assertEqual([1, 1], [c.count for c in filters[0].choices[1:]])
+
+        filters = get_filters({"city": "N"})
+        self.assertNotIn("count", filters[0].choices[1])
+
+
+class CountersConfigTestCase(TestCase):
+    def test_default_auto_field(self):
+        """The pk matches 0001_initial, whatever DEFAULT_AUTO_FIELD is."""
+        config = apps.get_app_config("genericfilters_counters")
+        self.assertEqual("django.db.models.AutoField", config.default_auto_field)
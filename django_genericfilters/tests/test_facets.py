@@ -0,0 +1,121 @@
+from django.test import RequestFactory, TestCase
+
+from django_genericfilters import views
+from django_genericfilters.facets import FacetCounter, FacetCounts
+from django_genericfilters.tests import test_views
+from django_genericfilters.tests.test_views import (
+    People,
+    Something,
+    Status,
+    setup_view,
+)
+
+
+class FacetCounterTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        people = People.objects.create(name="fake")
+        cls.status = Status.objects.create(name="status")
+        for i in range(30):
+            Something.objects.create(
+                city="N" if i % 3 else "P", people=people, status=cls.status
+            )
+
+    def test_exact(self):
+        counts = FacetCounter(Something.objects.all()).count("city")
+        self.assertEqual({"N": 20, "P": 10}, counts)
+        self.assertFalse(counts.approximate)
+
+    def test_sample(self):
+        counts = FacetCounter(Something.objects.all(), sample_size=6).count("city")
+        self.assertTrue(counts.approximate)
+        self.assertEqual(30, sum(counts.values()))
+
+    def test_sample_small_queryset(self):
+        queryset = Something.objects.filter(city="P")
+        counts = FacetCounter(queryset, sample_size=20).count("city")
+        self.assertEqual({"P": 10}, counts)
+        self.assertFalse(counts.approximate)
+
+    def test_filtered_list_view(self):
+        view = setup_view(
+            views.FilteredListView(
+                model=Something,
+                form_class=test_views.FilteredViewTestCase.Form,
+                filter_fields=["city", "status"],
+                facet_counts="exact",
+            ),
+            RequestFactory().get("/fake", {"city": "N"}),
+        )
+        view.object_list = view.get_queryset()
+        city, status = view.get_filters()
+
+        self.assertEqual(
+            {"": None, "N": 20, "P": 0}, {c.value: c.get("count") for c in city.choices}
+        )
+        self.assertFalse(city.approximate)
+        self.assertEqual(
+            20,
+            next(c.count for c in status.choices if c.value == self.status.pk),
+        )
+
+    def get_filters(self, data, **kwargs):
+        view = setup_view(
+            views.FilteredListView(
+                model=Something,
+                form_class=test_views.FilteredViewTestCase.Form,
+                filter_fields=["city", "status"],
+                **kwargs
+            ),
+            RequestFactory().get("/fake", data),
+        )
+        view.object_list = view.get_queryset()
+        return view.get_filters()
+
+    def test_empty_choices(self):
+        empty = Status.objects.create(name="empty")
+
+        with self.assertNumQueries(3):
+            # distinct city and status, status choices
+            city, status = self.get_filters({}, empty_choices="hide")
+        self.assertEqual(["", "N", "P"], [c.value for c in city.choices])
+        self.assertEqual(
+            [self.status.pk], [c.value.value for c in status.choices if c.value]
+        )
+
+        city, status = self.get_filters({"city": "P"}, empty_choices="disable")
+        self.assertEqual(
+            {"": None, "N": None, "P": None},
+            {c.value: c.get("disabled") for c in city.choices},
+        )
+        self.assertEqual(
+            {self.status.pk: None, empty.pk: True},
+            {c.value.value: c.get("disabled") for c in status.choices if c.value},
+        )
+
+    def test_empty_choices__facet_counts(self):
+        with self.assertNumQueries(4):
+            # selected status, facets of city and status, status choices
+            city, status = self.get_filters(
+                {"status": [self.status.pk]},
+                facet_counts="exact",
+                empty_choices="hide",
+            )
+        self.assertEqual(["", "N", "P"], [c.value for c in city.choices])
+
+    def test_empty_choices__approximate_facet_counts(self):
+        approximate = FacetCounts({"N": 20})
+        approximate.approximate = True
+        view = setup_view(
+            views.FilteredListView(
+                model=Something,
+                form_class=test_views.FilteredViewTestCase.Form,
+                filter_fields=["city"],
+            ),
+            RequestFactory().get("/fake"),
+        )
+        view.object_list = view.get_queryset()
+        view.form.is_valid()
+        with self.assertNumQueries(1):
+            present = view.get_present_values({"city": approximate})
+        self.assertEqual({"N", "P"}, present["city"])
@@ -1,8 +1,13 @@
 import unittest
 
 from django import forms
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase
 
 from django_genericfilters import forms as gf
+from django_genericfilters import views
+from django_genericfilters.tests import test_views
+from django_genericfilters.tests.test_views import setup_view
 
 
 class FieldTestCase(unittest.TestCase):
@@ -23,3 +28,79 @@ class FieldTestCase(unittest.TestCase):
 
         self.assertEqual(choices[1][0], "no")
         self.assertEqual(choices[1][1], "No Test")
+
+
+class DerivedChoiceFieldTestCase(TestCase):
+    class Form(forms.Form):
+        city = gf.DerivedChoiceField(
+            field="city", queryset=test_views.Something.objects.all()
+        )
+
+    @classmethod
+    def setUpTestData(cls):
+        test_views.SomethingFactory(city="Paris")
+        test_views.SomethingFactory(city="Nantes")
+        test_views.SomethingFactory(city="Nantes")
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_choices(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                [("", "All"), ("Nantes", "Nantes"), ("Paris", "Paris")],
+                list(self.Form().fields["city"].choices),
+            )
+        with self.assertNumQueries(0):
+            form = self.Form({"city": "Paris"})
+            self.assertTrue(form.is_valid())
+            self.assertFalse(self.Form({"city": "Lyon"}).is_valid())
+
+    def test_invalidation(self):
+        list(self.Form().fields["city"].choices)
+        test_views.SomethingFactory(city="Lyon")
+        self.assertEqual(
+            ["", "Lyon", "Nantes", "Paris"],
+            [value for value, label in self.Form().fields["city"].choices],
+        )
+
+    def test_filtered_list_view(self):
+        class Form(test_views.FilteredViewTestCase.Form):
+            city = gf.DerivedChoiceField()
+
+        view = setup_view(
+            views.FilteredListView(
+                model=test_views.Something,
+                form_class=Form,
+                filter_fields=["city"],
+            ),
+            RequestFactory().get("/fake", {"city": "Paris"}),
+        )
+        view.object_list = view.get_queryset()
+        self.assertEqual(["Paris"], [obj.city for obj in view.object_list])
+        (city,) = view.get_filters()
+        self.assertEqual(
+            {"": False, "Nantes": False, "Paris": True},
+            {c.value: c.is_selected for c in city.choices},
+        )
+
+    def test_filtered_list_view__foreign_key(self):
+        class Form(test_views.FilteredViewTestCase.Form):
+            status = gf.DerivedChoiceField()
+
+        status = test_views.Something.objects.first().status
+        view = setup_view(
+            views.FilteredListView(
+                model=test_views.Something,
+                form_class=Form,
+                filter_fields=["status"],
+            ),
+            RequestFactory().get("/fake", {"status": str(status.pk)}),
+        )
+        view.object_list = view.get_queryset()
+        self.assertEqual(status.pk, view.form.cleaned_data["status"])
+        self.assertEqual([status], [obj.status for obj in view.object_list])
+        (choices,) = view.get_filters()
+        self.assertEqual(
+            [status.pk], [c.value for c in choices.choices if c.is_selected]
+        )
@@ -14,6 +14,21 @@ class FormTestCase(unittest.TestCase):
 
         self.assertTrue("query" in form.fields)
 
+    def test_plan_query(self):
+        self.assertEqual(
+            ["john", "New York", "Doe"],
+            gf.plan_query('john "New  York" a Doe JOHN ""', min_length=2),
+        )
+        self.assertEqual(["a", "b"], gf.plan_query("a b c", max_terms=2))
+
+    def test_get_query_terms(self):
+        class Form(gf.QueryFormMixin, forms.Form):
+            query_max_terms = 2
+
+        form = Form(data={"query": 'x "john doe" john doe smith'})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(["john doe", "john"], form.get_query_terms())
+
     def test_order_form_mixin(self):
         def get_order_by_choices():
             return (("last_name", "Last Name"), ("first_name", "First Name"))
@@ -29,6 +44,21 @@ class FormTestCase(unittest.TestCase):
 
         self.assertEqual(form.fields["order_by"].choices, list(get_order_by_choices()))
 
+    def test_order_by_annotations(self):
+        annotations = {"num_things": "fake"}
+
+        class Form(gf.OrderFormMixin, forms.Form):
+            def get_order_by_choices(self):
+                return (("name", "Name"), ("num_things", "Things", annotations))
+
+        form = Form()
+
+        self.assertEqual(
+            [("name", "Name"), ("num_things", "Things")],
+            form.fields["order_by"].choices,
+        )
+        self.assertEqual({"num_things": annotations}, form.order_by_annotations)
+
     def test_get_order_by_choices_not_implemented(self):
         class Form(gf.OrderFormMixin):
             pass
@@ -0,0 +1,80 @@
+import threading
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from django_genericfilters import parallel, views
+from django_genericfilters.tests import test_views
+from django_genericfilters.tests.test_views import (
+    Something,
+    SomethingFactory,
+    setup_view,
+)
+
+
+def run_sequentially(tasks, max_workers):
+    return {name: func() for name, func in tasks.items()}
+
+
+class RunInThreadsTestCase(SimpleTestCase):
+    def test_run_in_threads(self):
+        results = parallel.run_in_threads(
+            {"a": lambda: 1, "b": lambda: threading.current_thread().name}, 2
+        )
+        self.assertEqual(1, results["a"])
+        self.assertTrue(results["b"].startswith("genericfilters"))
+
+    def test_exception(self):
+        def fail():
+            raise ValueError("fail")
+
+        with self.assertRaises(ValueError):
+            parallel.run_in_threads({"a": lambda: 1, "b": fail}, 2)
+
+
+class ParallelQueriesTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SomethingFactory.create_batch(12)
+
+    def get_view(self, data):
+        view = setup_view(
+            views.FilteredListView(
+                model=Something,
+                form_class=test_views.FilteredViewTestCase.Form,
+                filter_fields=["city", "parent"],
+                qs_filter_fields={"city": "city", "people": "parent"},
+                default_order="city",
+                paginate_by=5,
+                parallel_queries=True,
+                facet_counts="exact",
+            ),
+            RequestFactory().get("/fake", data),
+        )
+        view.object_list = view.get_queryset()
+        return view
+
+    def test_transaction_fallback(self):
+        view = self.get_view({"page": 2})
+        self.assertFalse(view.can_run_parallel_queries(view.object_list))
+        self.assertEqual(12, view.get_context_data()["paginator"].count)
+
+    @mock.patch.object(parallel, "run_in_threads", run_sequentially)
+    def test_run_parallel_queries(self):
+        view = self.get_view({"page": 2})
+        with self.assertNumQueries(5):
+            # count, rows, parent choices and facets for city and parent
+            view.run_parallel_queries(view.object_list)
+
+        view.parallel_queries = False
+        with self.assertNumQueries(0):
+            context = view.get_context_data()
+            self.assertEqual(12, context["paginator"].count)
+            self.assertEqual(2, context["page_obj"].number)
+            self.assertEqual(5, len(context["object_list"]))
+            self.assertEqual(13, len(context["filters"][1].choices))
+
+        self.assertEqual(
+            list(Something.objects.order_by("city")[5:10]),
+            context["object_list"],
+        )
@@ -0,0 +1,67 @@
+import tracemalloc
+
+from django.test import RequestFactory, TestCase
+
+from django_genericfilters import views
+from django_genericfilters.profiling import MemoryProfile
+from django_genericfilters.signals import memory_profiled
+from django_genericfilters.tests import test_views
+from django_genericfilters.tests.test_views import Something
+
+
+class MemoryProfileTestCase(TestCase):
+    def test_phase(self):
+        profile = MemoryProfile(top=3)
+        profile.start()
+        with profile.phase("allocate"):
+            data = [bytearray(1024) for i in range(100)]
+        profile.stop()
+
+        self.assertFalse(tracemalloc.is_tracing())
+        phase = profile.phases[0]
+        self.assertEqual("allocate", phase["name"])
+        self.assertGreater(phase["net"], 100 * 1024)
+        self.assertGreaterEqual(phase["peak"], phase["net"])
+        self.assertEqual(3, len(phase["top"]))
+        self.assertIn("test_profiling.py", phase["top"][0][0])
+        self.assertIn("allocate=", profile.summary())
+        self.assertIn("allocate: net", profile.report())
+        del data
+
+    def test_concurrent(self):
+        first = MemoryProfile()
+        second = MemoryProfile()
+        first.start()
+        second.start()
+        first.stop()
+        self.assertTrue(tracemalloc.is_tracing())
+        with second.phase("allocate"):
+            pass
+        second.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_filtered_list_view(self):
+        received = []
+
+        def receiver(sender, view, profile, **kwargs):
+            received.append(profile)
+
+        memory_profiled.connect(receiver)
+        self.addCleanup(memory_profiled.disconnect, receiver)
+
+        view = views.FilteredListView.as_view(
+            model=Something,
+            form_class=test_views.FilteredViewTestCase.Form,
+            default_order="city",
+            paginate_by=5,
+            template_name="genericfilters/pagination.html",
+            memory_profile=True,
+            memory_profile_output=("signal", "header"),
+        )
+        response = view(RequestFactory().get("/fake", {"city": "N"}))
+
+        self.assertEqual(
+            ["form", "queryset", "pagination", "filters", "render"],
+            [p["name"] for p in received[0].phases],
+        )
+        self.assertIn("form=", response["X-Memory-Profile"])
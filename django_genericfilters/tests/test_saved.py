@@ -0,0 +1,20 @@
+from django.test import TestCase
+
+from django_genericfilters.saved import MaterializedResults, decode_pks, encode_pks
+from django_genericfilters.tests.test_views import People
+
+
+class SavedSearchTestCase(TestCase):
+    def test_encode_pks(self):
+        self.assertIsInstance(encode_pks([3, 1, 2]), bytes)
+        self.assertEqual([3, 1, 2], list(decode_pks(encode_pks([3, 1, 2]))))
+        self.assertEqual(["b", "a"], decode_pks(encode_pks(["b", "a"])))
+
+    def test_materialized_results(self):
+        a, b, c = [People.objects.create(name=name) for name in "abc"]
+        results = MaterializedResults(People.objects.all(), [c.pk, 0, a.pk, b.pk])
+        self.assertEqual(4, results.count())
+        with self.assertNumQueries(1):
+            self.assertEqual([c, a], results[:3])
+        self.assertEqual(b, results[3])
+        self.assertEqual([c, a, b], list(results))
@@ -0,0 +1,91 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import models
+from django.test import RequestFactory, TestCase
+
+from django_genericfilters import views
+from django_genericfilters.search import normalize, register_search_column
+from django_genericfilters.tests import test_views
+from django_genericfilters.tests.test_views import People, setup_view
+
+
+class Article(models.Model):
+    title = models.CharField(max_length=250)
+    author = models.ForeignKey(People, null=True, on_delete=models.CASCADE)
+    search_text = models.TextField(blank=True)
+    views = models.IntegerField(default=0)
+
+
+class SearchColumnTestCase(TestCase):
+    def setUp(self):
+        self.search_column = register_search_column(Article, ["title", "author__name"])
+        self.addCleanup(self.search_column.disconnect)
+        self.author = People.objects.create(name="Émile Zola")
+
+    def test_normalize(self):
+        self.assertEqual("emile zola", normalize("Émile ZOLA"))
+
+    def test_save(self):
+        article = Article.objects.create(title="Germinal", author=self.author)
+        article.refresh_from_db()
+        self.assertEqual("germinal emile zola", article.search_text)
+
+        article.title = "L'Assommoir"
+        article.save(update_fields=["title"])
+        article.refresh_from_db()
+        self.assertEqual("l'assommoir emile zola", article.search_text)
+
+        article.author  # Load the author used by pre_save.
+        with self.assertNumQueries(1):
+            article.save(update_fields=["search_text"])
+        article.author = None
+        with self.assertNumQueries(2):
+            article.save(update_fields=["author"])
+        with self.assertNumQueries(1):
+            # No searched field is saved.
+            article.save(update_fields=["views"])
+
+    def test_backfill(self):
+        Article.objects.bulk_create(
+            [Article(title="Nana", author=self.author), Article(title="Au Bonheur")]
+        )
+        out = StringIO()
+        call_command("genericfilters_backfill_search", "--batch-size=1", stdout=out)
+        self.assertIn("2 rows", out.getvalue())
+        self.assertEqual(
+            ["au bonheur", "nana emile zola"],
+            sorted(Article.objects.values_list("search_text", flat=True)),
+        )
+
+    def test_filtered_list_view(self):
+        article = Article.objects.create(title="Germinal", author=self.author)
+        Article.objects.create(title="Nana")
+
+        view = views.FilteredListView(
+            model=Article,
+            form_class=test_views.FilteredViewTestCase.Form,
+            search_fields=["title", "author__name"],
+            search_column="search_text",
+        )
+        setup_view(view, RequestFactory().get("/fake", {"query": "ÉMILE"}))
+        self.assertTrue(view.form.is_valid(), view.form.errors)
+
+        queryset = view.form_valid(view.form)
+        self.assertIn('"search_text" LIKE', str(queryset.query))
+        self.assertEqual([article], list(queryset))
+
+    def test_bulk_action(self):
+        article = Article.objects.create(title="Germinal", author=self.author)
+        view = views.FilteredListView.as_view(
+            model=Article,
+            form_class=test_views.FilteredViewTestCase.Form,
+            bulk_actions={"rename": {"title": "Nana"}},
+        )
+        request = RequestFactory().post("/fake", {"bulk_action": "rename"})
+        request.user = User(is_superuser=True)
+        view(request)
+
+        article.refresh_from_db()
+        self.assertEqual("nana emile zola", article.search_text)
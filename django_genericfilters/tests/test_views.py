@@ -1,14 +1,19 @@
+import json
 import urllib
 
 import factory
 from django import forms
-from django.db import models
-from django.http import QueryDict
-from django.test import RequestFactory, TestCase
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import connection, models
+from django.db.models import Count, Q
+from django.http import Http404, QueryDict
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.datastructures import MultiValueDict
 
 from django_genericfilters import views
 from django_genericfilters.forms import FilteredForm
+from django_genericfilters.signals import bulk_action_progress
 
 
 def setup_view(view, request, *args, **kwargs):
@@ -615,3 +620,370 @@ class FilteredViewTestCase(TestCase):
         request = RequestFactory().get("/fake")
         view = setup_view(views.FilteredListView(), request)
         assert view.is_form_submitted() is False
+
+    def test_pagination_strategy_window(self):
+        """Count and page rows are fetched in a single query."""
+        view = setup_view(
+            views.FilteredListView(
+                model=Something,
+                form_class=self.Form,
+                default_order="city",
+                paginate_by=5,
+                pagination_strategy="window",
+            ),
+            RequestFactory().get("/fake", {"page": 2}),
+        )
+        view.object_list = view.get_queryset()
+
+        with self.assertNumQueries(1):
+            context = view.get_context_data()
+            self.assertEqual(20, context["paginator"].count)
+            object_list = list(context["object_list"])
+
+        self.assertEqual(list(Something.objects.order_by("city")[5:10]), object_list)
+        self.assertFalse(hasattr(context["object_list"][0], "_genericfilters_total"))
+
+    def test_pagination_strategy_window__empty_page(self):
+        """An empty page falls back to a COUNT query."""
+        view = setup_view(
+            views.FilteredListView(
+                model=Something,
+                form_class=self.Form,
+                default_order="city",
+                paginate_by=5,
+                pagination_strategy="window",
+            ),
+            RequestFactory().get("/fake", {"page": 10}),
+        )
+        view.object_list = view.get_queryset()
+
+        with self.assertNumQueries(2):
+            self.assertRaises(Http404, view.get_context_data)
+
+    def test_pagination_strategy_deferred_join(self):
+        """Page primary keys are read first, then only their rows."""
+        view = setup_view(
+            views.FilteredListView(
+                model=Something,
+                form_class=self.Form,
+                default_order="city",
+                paginate_by=5,
+                pagination_strategy="deferred_join",
+            ),
+            RequestFactory().get("/fake", {"page": 3}),
+        )
+        view.object_list = view.get_queryset()
+
+        with CaptureQueriesContext(connection) as queries:
+            context = view.get_context_data()
+            object_list = list(context["object_list"])
+
+        # count, page primary keys, page rows
+        self.assertEqual(3, len(queries))
+        self.assertIn("LIMIT", queries[1]["sql"])
+        self.assertNotIn("city", queries[1]["sql"].split("FROM")[0])
+        self.assertNotIn("LIMIT", queries[2]["sql"])
+        self.assertEqual(list(Something.objects.order_by("city")[10:15]), object_list)
+
+    def test_filtered_list_view__large_multiplechoice(self):
+        """Large lists of values are deduplicated, sorted and use AnyIn."""
+        view = views.FilteredListView(
+            qs_filter_fields={"organization": "organization"},
+            form_class=self.Form,
+            model=Something,
+            large_in_threshold=2,
+        )
+        setup_view(view, RequestFactory().get("/fake"))
+
+        self.assertEqual(
+            {"organization__in": ["A", "C"]},
+            view.clean_qs_filter_field("organization", ["C", "A", "C"]),
+        )
+        self.assertEqual(
+            {"organization__genericfilters_any": ["A", "B", "C"]},
+            view.clean_qs_filter_field("organization", ["C", "A", "B", "A"]),
+        )
+
+        data = MultiValueDict({"organization": ["C", "A", "B"]})
+        setup_view(view, RequestFactory().get("/fake", data))
+        self.assertTrue(view.form.is_valid(), view.form.errors)
+        self.assertEqual(
+            Something.objects.filter(organization__in=["A", "B", "C"]).count(),
+            view.form_valid(view.form).count(),
+        )
+
+    def test_filtered_list_view__multivalued_relations(self):
+        """Lookups across reverse relations use EXISTS without duplicates."""
+        people = People.objects.create(name="fake")
+        Something.objects.create(city="Nantes", organization="A", people=people)
+        Something.objects.create(city="Nantes", organization="A", people=people)
+
+        view = views.FilteredListView(
+            qs_filter_fields={"something__organization": "organization"},
+            search_fields=["name", "something__city"],
+            form_class=self.Form,
+            model=People,
+        )
+        data = MultiValueDict({"query": ["nantes"], "organization": ["A"]})
+        setup_view(view, RequestFactory().get("/fake", data))
+        self.assertTrue(view.form.is_valid(), view.form.errors)
+
+        queryset = view.form_valid(view.form)
+        self.assertIn("EXISTS", str(queryset.query))
+        self.assertNotIn("JOIN", str(queryset.query).split("EXISTS")[0])
+        self.assertEqual([people], list(queryset))
+
+    def test_search_operator(self):
+        """Every searched word must match one of search_fields."""
+        people = People.objects.create(name="John")
+        match = Something.objects.create(city="Zqnantes", country="Zqfr", people=people)
+        Something.objects.create(city="Zqnantes", country="Zquk", people=people)
+
+        def search(query, **kwargs):
+            view = views.FilteredListView(
+                search_fields=["city", "country"],
+                form_class=self.Form,
+                model=Something,
+                **kwargs
+            )
+            setup_view(view, RequestFactory().get("/fake", {"query": query}))
+            self.assertTrue(view.form.is_valid(), view.form.errors)
+            return view.form_valid(view.form)
+
+        self.assertEqual([match], list(search("zqnantes zqfr ZQNANTES")))
+        self.assertEqual(0, search('"zqnantes zqfr"').count())
+        self.assertEqual(2, search("zqnantes zqfr", search_operator="or").count())
+        self.assertEqual(0, search("a").count())
+        self.assertEqual(0, search("a z", search_operator="or").count())
+
+    def test_search_lookups(self):
+        """search_fields prefixes select the lookup of each field."""
+        people = People.objects.create(name="John")
+        exact = Something.objects.create(
+            city="Zqville", country="X", organization="A", people=people
+        )
+        other = Something.objects.create(
+            city="Zqvillebis", country="X", organization="B", people=people
+        )
+
+        def search(query, search_fields, data=None, **kwargs):
+            view = views.FilteredListView(
+                search_fields=search_fields,
+                form_class=self.Form,
+                model=Something,
+                **kwargs
+            )
+            data = dict(data or {}, query=query)
+            setup_view(view, RequestFactory().get("/fake", data))
+            self.assertTrue(view.form.is_valid(), view.form.errors)
+            return view.form_valid(view.form)
+
+        self.assertEqual([exact], list(search("zqville", ["=city"])))
+        self.assertEqual(2, search("zqvil", ["^city"]).count())
+        self.assertEqual(0, search("qvil", ["^city"]).count())
+        self.assertEqual(2, search("zqville", ["=country", "city"]).count())
+        self.assertEqual(("city", "istartswith"), views.split_search_field("^city"))
+        self.assertNotIn("$", views.SEARCH_LOOKUPS)
+
+        queryset = search("zqville", ["=city", "city"], search_exact_first=True)
+        self.assertEqual([exact], list(queryset))
+        self.assertNotIn("%zqville%", str(queryset.query))
+        queryset = search("zqvillebi", ["=city", "city"], search_exact_first=True)
+        self.assertEqual([other], list(queryset))
+
+        # The exact match is outside of the filtered objects.
+        queryset = search(
+            "zqville",
+            ["=city", "city"],
+            {"organization": "B"},
+            qs_filter_fields={"organization": "organization"},
+            search_exact_first=True,
+        )
+        self.assertEqual([other], list(queryset))
+
+    def test_is_multivalued(self):
+        self.assertTrue(views.is_multivalued(People, "something__city"))
+        self.assertTrue(views.is_multivalued(Status, "something__people__name"))
+        self.assertFalse(views.is_multivalued(Something, "people__name"))
+        self.assertFalse(views.is_multivalued(Something, "city__icontains"))
+
+    @override_settings(DEBUG=True)
+    def test_query_budget(self):
+        """Requests over query_budget raise QueryBudgetExceeded in DEBUG."""
+        view = views.FilteredListView.as_view(
+            model=Something,
+            form_class=self.Form,
+            default_order="city",
+            paginate_by=5,
+            template_name="genericfilters/pagination.html",
+            query_budget={"html": 0, "json": 5},
+        )
+        with self.assertRaisesMessage(
+            views.QueryBudgetExceeded,
+            "ran 1 queries, its budget is 0:\n1. SELECT COUNT",
+        ):
+            view(RequestFactory().get("/fake"))
+
+        view = views.FilteredListView.as_view(
+            model=Something,
+            form_class=self.Form,
+            default_order="city",
+            paginate_by=5,
+            template_name="genericfilters/pagination.html",
+            query_budget=0,
+            query_budget_action="log",
+        )
+        with self.assertLogs("django_genericfilters.views", "ERROR"):
+            view(RequestFactory().get("/fake"))
+
+    def test_order_by_annotations(self):
+        """Order annotations are only added for their order, not counted."""
+
+        class Form(FilteredForm):
+            def get_order_by_choices(self):
+                return (
+                    ("name", "Name"),
+                    ("num_things", "Things", {"num_things": Count("something")}),
+                )
+
+        more = People.objects.first()
+        SomethingFactory(people=more)
+
+        def get_context(data):
+            view = setup_view(
+                views.FilteredListView(model=People, form_class=Form, paginate_by=5),
+                RequestFactory().get("/fake", data),
+            )
+            view.object_list = view.get_queryset()
+            with CaptureQueriesContext(connection) as queries:
+                context = view.get_context_data()
+                list(context["object_list"])
+            return context, [q["sql"] for q in queries]
+
+        context, queries = get_context({"order_by": "name"})
+        self.assertEqual(2, len(queries))
+        self.assertNotIn("JOIN", "".join(queries))
+
+        context, queries = get_context({"order_by": "num_things", "order_reverse": 1})
+        self.assertEqual(People.objects.count(), context["paginator"].count)
+        self.assertEqual(more, context["object_list"][0])
+        self.assertNotIn("JOIN", queries[0])
+        self.assertIn("JOIN", queries[1])
+
+        class FacetForm(Form):
+            name = forms.ChoiceField(
+                required=False, choices=[(more.name, more.name), ("zq", "zq")]
+            )
+
+        view = setup_view(
+            views.FilteredListView(
+                model=People,
+                form_class=FacetForm,
+                filter_fields=["name"],
+                facet_counts="exact",
+                empty_choices="disable",
+            ),
+            RequestFactory().get("/fake", {"order_by": "num_things"}),
+        )
+        view.object_list = view.get_queryset()
+        (name,) = view.get_filters()
+        self.assertEqual(1, name.choices[1].count)
+
+        view.facet_counts = None
+        (name,) = view.get_filters()
+        self.assertEqual([None, None, True], [c.get("disabled") for c in name.choices])
+
+    def test_bulk_action(self):
+        """Bulk actions update or delete every filtered object by chunks."""
+        Something.objects.filter(pk__in=Something.objects.all()[:5]).update(city="N")
+
+        class View(views.FilteredListView):
+            filter_fields = ["city"]
+
+        view = View.as_view(
+            model=Something,
+            form_class=self.Form,
+            bulk_actions={"paris": {"city": "P"}, "delete": "delete"},
+            json_fields=["id", "city"],
+            bulk_action_chunk_size=2,
+        )
+
+        progress = []
+
+        def receiver(sender, done, total, **kwargs):
+            progress.append((done, total))
+
+        bulk_action_progress.connect(receiver)
+        self.addCleanup(bulk_action_progress.disconnect, receiver)
+        request = RequestFactory().post("/fake?city=N", {"bulk_action": "paris"})
+        request.user = AnonymousUser()
+        self.assertEqual(403, view(request).status_code)
+        self.assertEqual(0, Something.objects.filter(city="P").count())
+
+        request.user = User(is_superuser=True)
+        invalid = RequestFactory().post("/fake?city=X", {"bulk_action": "paris"})
+        invalid.user = request.user
+        self.assertEqual(400, view(invalid).status_code)
+        self.assertEqual(0, Something.objects.filter(city="P").count())
+
+        response = view(request)
+        self.assertEqual(302, response.status_code)
+        self.assertEqual("/fake?city=N", response["Location"])
+        self.assertEqual([(2, 5), (4, 5), (5, 5)], progress)
+        self.assertEqual(5, Something.objects.filter(city="P").count())
+
+        request = RequestFactory().post(
+            "/fake?city=P&format=json",
+            {"bulk_action": "delete"},
+            HTTP_ACCEPT="application/json",
+        )
+        request.user = User(is_superuser=True)
+        response = view(request)
+        self.assertEqual({"action": "delete", "count": 5}, json.loads(response.content))
+        self.assertEqual(15, Something.objects.count())
+
+        response = view(RequestFactory().post("/fake", {"bulk_action": "unknown"}))
+        self.assertEqual(400, response.status_code)
+
+    def test_dashboard(self):
+        """Dashboard lists are counted with a single query."""
+        Something.objects.filter(pk__in=Something.objects.all()[:3]).update(city="N")
+        Something.objects.filter(pk__in=Something.objects.all()[3:10]).update(city="P")
+        view = setup_view(
+            views.FilteredDashboardView(
+                model=Something,
+                form_class=self.Form,
+                lists={
+                    "nantes": {
+                        "filter": {"city": "N"},
+                        "ordering": "pk",
+                        "label": "Nantes",
+                    },
+                    "paris": {"filter": Q(city="P"), "ordering": "-pk"},
+                },
+                list_paginate_by=5,
+            ),
+            RequestFactory().get("/fake", {"paris-page": 2}),
+        )
+        view.object_list = view.get_queryset()
+        with self.assertNumQueries(3):
+            context = view.get_context_data()
+            nantes, paris = context["lists"]
+            self.assertEqual(3, len(nantes.object_list))
+            self.assertEqual(2, len(paris.object_list))
+
+        self.assertEqual("Nantes", nantes.label)
+        self.assertEqual(3, nantes.paginator.count)
+        self.assertFalse(nantes.is_paginated)
+        self.assertEqual(7, paris.paginator.count)
+        self.assertEqual(2, paris.page_obj.number)
+        self.assertEqual("paris-page", paris.page_kwarg)
+        self.assertEqual(
+            list(Something.objects.filter(city="P").order_by("-pk")[5:]),
+            list(paris.object_list),
+        )
+
+    def test_get_filtered_list_views(self):
+        from demoproject.filter.views import UserListView
+
+        self.assertEqual([("/filter/", UserListView)], views.get_filtered_list_views())
@@ -1,23 +1,177 @@
+import hashlib
+import logging
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from functools import partial
+from urllib.parse import urlsplit
+
 from django import forms
-from django.db.models import Q, QuerySet
-from django.http import QueryDict
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.core.paginator import InvalidPage
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+from django.db.models import Count, Exists, OuterRef, Q, QuerySet, Window
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable, ValuesIterable
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    HttpResponseRedirect,
+    QueryDict,
+)
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver
+from django.utils.cache import patch_vary_headers
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import ListView
 from django.views.generic.edit import FormMixin
 from munch import Munch
 
+from . import coalesce, parallel
+from .budgets import QueryBudgetExceeded, format_budget_error
+from .facets import FacetCounter, FacetCounts
+from .fields import DerivedChoiceField, invalidate_derived_choices
+from .lookups import AnyIn
+from .profiling import MemoryProfile
+from .saved import MaterializedResults, decode_pks, get_saved_search_key, make_entry
+from .search import normalize
+from .search import registry as search_columns
+from .serializers import dumps
+from .signals import bulk_action_progress, memory_profiled
+
+logger = logging.getLogger(__name__)
+
 EMPTY_FILTER_VALUES = (None, "", "-1")
+SEARCH_LOOKUPS = {"=": "iexact", "^": "istartswith", "@": "search"}
+WINDOW_COUNT_ANNOTATION = "_genericfilters_total"
 
 
 def is_filter(value, form):
     return bool(value in form.cleaned_data and form.cleaned_data[value])
 
 
+def is_multivalued(model, lookup):
+    """Return True if lookup spans a many-valued relation of model."""
+    opts = model._meta
+    for name in lookup.split(LOOKUP_SEP):
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        if field.many_to_many or field.one_to_many:
+            return True
+        if field.related_model is None:
+            return False
+        opts = field.related_model._meta
+    return False
+
+
+def split_search_field(field):
+    """
+    Return the (field, lookup) of a search_fields entry, whose first
+    character may select the lookup like in the Django admin: ``=`` for
+    iexact, ``^`` for istartswith, ``@`` for search.
+    """
+    lookup = SEARCH_LOOKUPS.get(field[:1])
+    if lookup is None:
+        return field, "icontains"
+    return field[1:], lookup
+
+
+def unique_sorted(values):
+    """Return values without duplicates, sorted when they are comparable."""
+    values = [getattr(value, "pk", value) for value in values]
+    try:
+        values = list(dict.fromkeys(values))
+    except TypeError:
+        return values
+    try:
+        return sorted(values)
+    except TypeError:
+        return values
+
+
+def facet_key(value):
+    """Return the key used to match a filter value against facet counts."""
+    return str(getattr(value, "pk", value))
+
+
+def get_filtered_list_views(urlconf=None):
+    """
+    Return a list of (path, view class) for the FilteredListView URL
+    patterns of urlconf that take no argument.
+    """
+    views = []
+
+    def walk(resolver, prefix):
+        for pattern in resolver.url_patterns:
+            route = prefix + str(pattern.pattern).lstrip("^").rstrip("$")
+            if isinstance(pattern, URLResolver):
+                walk(pattern, route)
+                continue
+            view_class = getattr(pattern.callback, "view_class", None)
+            if (
+                view_class is not None
+                and issubclass(view_class, FilteredListView)
+                and "<" not in route
+                and "(" not in route
+            ):
+                views.append(("/" + route, view_class))
+
+    walk(get_resolver(urlconf), "")
+    return views
+
+
 class FilteredListView(FormMixin, ListView):
     """A Generic ListView used to filter and order objects."""
 
     default_order = None
     default_filter = None
+    filter_index = None
+    pagination_strategy = None
+    large_in_threshold = 1000
+    use_exists_subqueries = True
+    search_column = None
+    search_operator = "and"
+    search_exact_first = False
+    fragment_templates = {
+        "filters": "genericfilters/filter_list.html",
+        "pagination": "genericfilters/pagination.html",
+    }
+    fragments_header = "X-Fragments"
+    current_url_header = "HX-Current-URL"
+    json_fields = None
+    json_format_param = "format"
+    facet_counts = None
+    facet_sample_size = 10000
+    empty_choices = None
+    memory_profile = False
+    memory_profile_top = 10
+    memory_profile_output = ("log",)
+    query_budget = None
+    query_budget_action = "raise"
+    parallel_queries = False
+    parallel_queries_workers = 4
+    metadata_cache = None
+    facet_counters = None
+    saved_searches = None
+    saved_search_param = "saved"
+    saved_search_cache = "default"
+    metadata_cache_timeout = 60
+    count_stale_after = None
+    bulk_actions = None
+    bulk_action_permission = None
+    bulk_action_param = "bulk_action"
+    bulk_action_chunk_size = 1000
+    coalesce_requests = False
+    coalesce_cache = None
+    coalesce_timeout = 10
 
     def is_form_submitted(self):
         """
@@ -47,7 +201,10 @@ class FilteredListView(FormMixin, ListView):
         if self.default_filter:
             data.update(self.default_filter)
 
-        if self.is_form_submitted():
+        if self.get_saved_search() is not None:
+            data.update(self.saved_searches[self.get_saved_search()])
+        elif self.is_form_submitted() or self.request.method == "POST":
+            # Bulk actions apply to the filters of the query string.
             data.update(self.request.GET)
 
         kwargs.update({"data": data})
@@ -58,13 +215,235 @@ class FilteredListView(FormMixin, ListView):
         """Helper to get ListView default queryset."""
         return super(ListView, self).get_queryset()
 
+    def dispatch(self, request, *args, **kwargs):
+        """Enforce query_budget on GET requests when DEBUG is on."""
+        if not settings.DEBUG or self.query_budget is None or request.method != "GET":
+            return super(FilteredListView, self).dispatch(request, *args, **kwargs)
+
+        using = router.db_for_read(self.model) if self.model else DEFAULT_DB_ALIAS
+        with CaptureQueriesContext(connections[using]) as queries:
+            response = super(FilteredListView, self).dispatch(request, *args, **kwargs)
+            if not getattr(response, "is_rendered", True):
+                response.render()
+        self.check_query_budget(queries.captured_queries)
+        return response
+
+    def get_query_budget(self):
+        """
+        Return the maximum number of queries of the current request, or None.
+
+        query_budget is either a number or a dict of budgets for "html",
+        "json" and "fragments" requests.
+        """
+        budget = self.query_budget
+        if not isinstance(budget, dict):
+            return budget
+        if self.is_json_request():
+            return budget.get("json")
+        if self.get_fragments() is not None:
+            return budget.get("fragments", budget.get("html"))
+        return budget.get("html")
+
+    def check_query_budget(self, queries):
+        """Raise or log an error if queries exceed the query budget."""
+        budget = self.get_query_budget()
+        if budget is None or len(queries) <= budget:
+            return
+        message = format_budget_error(self.__class__.__name__, budget, queries)
+        if self.query_budget_action == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.error(message)
+
+    def get(self, request, *args, **kwargs):
+        """Handle GET requests, profiling memory if memory_profile is set."""
+        if not self.memory_profile:
+            return super(FilteredListView, self).get(request, *args, **kwargs)
+
+        self._memory_profile = MemoryProfile(top=self.memory_profile_top)
+        self._memory_profile.start()
+        try:
+            self.form
+            response = super(FilteredListView, self).get(request, *args, **kwargs)
+            if not getattr(response, "is_rendered", True):
+                with self.profile_phase("render"):
+                    response.render()
+        finally:
+            self._memory_profile.stop()
+        self.report_memory_profile(self._memory_profile, response)
+        return response
+
+    def post(self, request, *args, **kwargs):
+        """Run the bulk action named in POST data on the filtered objects."""
+        name = request.POST.get(self.bulk_action_param)
+        actions = self.get_bulk_actions()
+        if name not in actions:
+            if name in (self.bulk_actions or {}):
+                return HttpResponseForbidden()
+            return HttpResponseBadRequest()
+        if not self.form.is_valid():
+            # form_invalid() would return every object.
+            return HttpResponseBadRequest()
+
+        queryset = self.get_count_queryset(self.form_valid(self.form))
+        count = self.run_bulk_action(name, actions[name], queryset)
+        if self.is_json_request():
+            return HttpResponse(
+                dumps({"action": name, "count": count}),
+                content_type="application/json",
+            )
+        messages.success(
+            request,
+            _("%(action)s: %(count)d objects") % {"action": name, "count": count},
+            fail_silently=True,
+        )
+        return HttpResponseRedirect(request.get_full_path())
+
+    def get_bulk_actions(self):
+        """Return the dict of bulk actions the current request may run."""
+        if not self.has_bulk_action_permission():
+            return {}
+        return self.bulk_actions or {}
+
+    def has_bulk_action_permission(self):
+        """
+        Return True if the user has bulk_action_permission, by default the
+        change permission of the model.
+        """
+        user = getattr(self.request, "user", None)
+        if user is None:
+            return False
+        permission = self.bulk_action_permission
+        if permission is None:
+            opts = self.get_filtered_queryset().model._meta
+            permission = "%s.change_%s" % (opts.app_label, opts.model_name)
+        if isinstance(permission, str):
+            permission = [permission]
+        return user.has_perms(permission)
+
+    def run_bulk_action(self, name, action, queryset):
+        """
+        Apply action to every object of queryset and return their number.
+
+        action is a dict of values to update, "delete", or a callable
+        receiving querysets. Objects are processed by chunks of
+        bulk_action_chunk_size primary keys, each in its own transaction,
+        and bulk_action_progress is sent after each chunk.
+
+        As updates bypass model signals, the search column of the objects
+        is recomputed with each chunk and refresh_after_bulk_action() is
+        called at the end.
+        """
+        total = queryset.count()
+        done = 0
+        using = queryset.db
+        manager = queryset.model._base_manager.db_manager(using)
+        pks = queryset.order_by("pk").values_list("pk", flat=True)
+        last_pk = None
+        while True:
+            chunk = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+            chunk = list(chunk[: self.bulk_action_chunk_size])
+            if not chunk:
+                self.refresh_after_bulk_action(queryset.model)
+                return done
+            with transaction.atomic(using=using):
+                objects = manager.filter(pk__in=chunk)
+                if action == "delete":
+                    objects.delete()
+                elif callable(action):
+                    action(objects)
+                else:
+                    objects.update(**action)
+                search_column = search_columns.get(queryset.model)
+                if search_column is not None and action != "delete":
+                    fields = {f.split(LOOKUP_SEP)[0] for f in search_column.fields}
+                    if callable(action) or fields.intersection(action):
+                        search_column.backfill(queryset=objects)
+            done += len(chunk)
+            last_pk = chunk[-1]
+            bulk_action_progress.send(
+                sender=self.__class__, view=self, action=name, done=done, total=total
+            )
+
+    def refresh_after_bulk_action(self, model):
+        """
+        Refresh what model signals keep current, after a bulk action on
+        model: the filter_index of this process, facet_counters and the
+        choices of DerivedChoiceField.
+        """
+        if self.filter_index is not None and self.filter_index.model is model:
+            self.filter_index.invalidate()
+        if self.facet_counters is not None and self.facet_counters.model is model:
+            self.facet_counters.rebuild()
+        invalidate_derived_choices(model)
+
+    def profile_phase(self, name):
+        """Return a context manager recording the memory of a phase."""
+        profile = getattr(self, "_memory_profile", None)
+        if profile is None:
+            return nullcontext()
+        return profile.phase(name)
+
+    def report_memory_profile(self, profile, response):
+        """Send profile to the outputs listed in memory_profile_output."""
+        if "log" in self.memory_profile_output:
+            logger.info(
+                "Memory profile of %s %s\n%s",
+                self.__class__.__name__,
+                self.request.get_full_path(),
+                profile.report(),
+            )
+        if "signal" in self.memory_profile_output:
+            memory_profiled.send(sender=self.__class__, view=self, profile=profile)
+        if "header" in self.memory_profile_output:
+            response["X-Memory-Profile"] = profile.summary()
+
     def get_queryset(self):
         """Return filtered queryset. Uses form_valid() or form_invalid()."""
+        with self.profile_phase("queryset"):
+            name = self.get_saved_search()
+            if name is not None:
+                results = self.get_materialized_results(name)
+                if results is not None:
+                    return results
+            return self.get_filtered_queryset()
+
+    def get_filtered_queryset(self):
+        """Return the queryset filtered by the form."""
         if self.form.is_valid():
             return self.form_valid(self.form)
         else:
             return self.form_invalid(self.form)
 
+    def get_saved_search(self):
+        """Return the name of the requested saved search, or None."""
+        name = self.request.GET.get(self.saved_search_param)
+        if self.saved_searches and name in self.saved_searches:
+            return name
+        return None
+
+    def get_materialized_results(self, name):
+        """
+        Return the objects of the saved search name as stored by
+        refresh_saved_search(), or None if it was not refreshed.
+        """
+        cache = caches[self.saved_search_cache]
+        entry = cache.get(get_saved_search_key(self.__class__, name))
+        if entry is None:
+            return None
+        self._saved_search_entry = entry
+        return MaterializedResults(self.__get_queryset(), decode_pks(entry["pks"]))
+
+    def refresh_saved_search(self, name):
+        """
+        Store the primary keys of the objects of the saved search name.
+        Return their number.
+        """
+        queryset = self.get_filtered_queryset()
+        pks = list(queryset.values_list("pk", flat=True))
+        cache = caches[self.saved_search_cache]
+        cache.set(get_saved_search_key(self.__class__, name), make_entry(pks), None)
+        return len(pks)
+
     def get_qs_filters(self):
         """
         retreive filters from "qs_filter_fields" or "filter_fields"
@@ -91,7 +470,10 @@ class FilteredListView(FormMixin, ListView):
                 return {"%s__in" % key: value}
         elif isinstance(value, (tuple, list)):
             if len(value) > 0:
-                return {"%s__in" % key: value}
+                values = unique_sorted(value)
+                if len(values) > self.large_in_threshold:
+                    return {"%s__%s" % (key, AnyIn.lookup_name): values}
+                return {"%s__in" % key: values}
         else:
             return {key: value}
 
@@ -106,18 +488,6 @@ class FilteredListView(FormMixin, ListView):
         # Get default queryset from ListView parameters (queryset, model, ...)
         queryset = self.__get_queryset()
 
-        # Handle QueryFormMixin
-        if is_filter("query", form):
-            query = form.cleaned_data["query"]
-            query_words = query.split()
-            filters = None
-            for f in self.search_fields:
-                for word in query_words:
-                    q = Q(**{f + "__icontains": word})
-                    filters = filters | q if filters else q
-            if filters:
-                queryset = queryset.filter(filters)
-
         # Handle get_qs_filters
         filters = {}
         extra_conditions = getattr(self, "qs_filter_fields_conditions", None)
@@ -135,18 +505,426 @@ class FilteredListView(FormMixin, ListView):
                     for key, value in filter_fields_conditions.items():
                         filters[key] = value
 
-        queryset = queryset.filter(**filters)
+        # Handle QueryFormMixin
+        if is_filter("query", form):
+            if hasattr(form, "get_query_terms"):
+                terms = form.get_query_terms()
+            else:
+                terms = form.cleaned_data["query"].split()
+            if not terms:
+                # Every term was dropped: search nothing rather than all.
+                queryset = queryset.none()
+            search = None
+            if self.search_exact_first:
+                search = self.get_exact_search_filters(terms)
+                if search is not None:
+                    # Probe among the objects matching the other filters.
+                    probe = self.filter_queryset(queryset, filters)
+                    if not probe.filter(search).exists():
+                        search = None
+            if search is None:
+                search = self.get_search_filters(queryset, terms)
+            if search:
+                queryset = queryset.filter(search)
+
+        # Handle filter_index
+        use_index = self.can_use_filter_index(queryset, filters)
+        if use_index:
+            queryset = self.filter_with_index(queryset, filters)
+        else:
+            queryset = self.filter_queryset(queryset, filters)
 
         # Handle OrderFormMixin
+        count_queryset = queryset
         if is_filter("order_by", form):
             order_field = form.cleaned_data["order_by"]
+            queryset = self.annotate_order(queryset, order_field)
             queryset = queryset.order_by(order_field)
 
         if is_filter("order_reverse", form):
             queryset = queryset.reverse()
 
+        if use_index:
+            self._indexed_queryset = queryset
+        if queryset.query.annotations.keys() != count_queryset.query.annotations.keys():
+            self._count_queryset = (queryset, count_queryset)
+
+        return queryset
+
+    def annotate_order(self, queryset, order_field):
+        """Add the annotations declared by the order_by choice order_field."""
+        annotations = getattr(self.form, "order_by_annotations", {})
+        annotations = annotations.get(order_field) or annotations.get(
+            order_field.lstrip("-")
+        )
+        if annotations:
+            queryset = queryset.annotate(**annotations)
         return queryset
 
+    def get_count_queryset(self, queryset):
+        """
+        Return the queryset to count the objects of queryset with, without
+        the annotations only required by its ordering.
+        """
+        counted = getattr(self, "_count_queryset", None)
+        if counted is not None and queryset is counted[0]:
+            return counted[1]
+        return queryset
+
+    def get_search_filters(self, queryset, words):
+        """
+        Return a Q object matching objects where search_fields contain
+        words, or None.
+
+        With search_operator "and", every word must be contained by one of
+        the fields. With "or", any word contained by any field is enough.
+        """
+        filters = None
+        for word in words:
+            q = self.get_word_filter(queryset, word)
+            if filters is None:
+                filters = q
+            elif self.search_operator == "or":
+                filters |= q
+            else:
+                filters &= q
+        return filters
+
+    def get_exact_search_filters(self, words):
+        """
+        Return a Q object matching objects where one of the ``=`` fields of
+        search_fields is the single word searched, or None.
+        """
+        fields = [
+            f
+            for f, lookup in map(split_search_field, self.search_fields)
+            if lookup == "iexact"
+        ]
+        if len(words) != 1 or not fields:
+            return None
+        filters = Q()
+        for f in fields:
+            filters |= Q(**{f + "__iexact": words[0]})
+        return filters
+
+    def get_word_filter(self, queryset, word):
+        """
+        Return a Q object matching objects where any of search_fields
+        contains word.
+
+        With search_column, word is matched against that single
+        normalized column instead.
+        """
+        if self.search_column:
+            return Q(**{self.search_column + "__contains": normalize(word)})
+
+        filters = None
+        related = None
+        for f in self.search_fields:
+            f, lookup = split_search_field(f)
+            q = Q(**{"%s__%s" % (f, lookup): word})
+            if self.use_exists_subqueries and is_multivalued(queryset.model, f):
+                related = related | q if related else q
+            else:
+                filters = filters | q if filters else q
+
+        if related is not None:
+            q = Q(self.exists_subquery(queryset.model, related))
+            filters = filters | q if filters else q
+        return filters
+
+    def filter_queryset(self, queryset, filters):
+        """
+        Filter queryset with a dict of lookups. Lookups spanning
+        multi-valued relations are grouped in an EXISTS subquery.
+        """
+        if self.use_exists_subqueries:
+            related = {
+                k: v for k, v in filters.items() if is_multivalued(queryset.model, k)
+            }
+            if related:
+                filters = {k: v for k, v in filters.items() if k not in related}
+                queryset = queryset.filter(
+                    self.exists_subquery(queryset.model, **related)
+                )
+        return queryset.filter(**filters)
+
+    def exists_subquery(self, model, *args, **kwargs):
+        """Return an Exists() expression filtering model on the outer pk."""
+        return Exists(model._base_manager.filter(*args, pk=OuterRef("pk"), **kwargs))
+
+    def can_use_filter_index(self, queryset, filters):
+        """Return True if filter_index can answer filters on queryset."""
+        return (
+            self.filter_index is not None
+            and queryset.model is self.filter_index.model
+            and not queryset.query.has_filters()
+            and self.filter_index.covers(filters)
+        )
+
+    def filter_with_index(self, queryset, filters):
+        """
+        Filter queryset using filter_index.
+
+        When few rows match, their primary keys are added to the filters,
+        which are kept in case the index is stale. Otherwise the filters
+        are applied as usual and the index is only used for counts.
+        """
+        self._indexed_filters = filters
+        if self.filter_index.count(filters) <= self.filter_index.max_pks:
+            return queryset.filter(pk__in=self.filter_index.pks(filters), **filters)
+        return queryset.filter(**filters)
+
+    def get_paginator(
+        self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs
+    ):
+        """Return a paginator whose count comes from get_result_count()."""
+        paginator = super(FilteredListView, self).get_paginator(
+            queryset, per_page, orphans, allow_empty_first_page, **kwargs
+        )
+        count = self.get_result_count(queryset)
+        if count is None and self.get_count_queryset(queryset) is not queryset:
+            count = self.get_count_queryset(queryset).count()
+        if count is not None:
+            paginator.count = count
+        return paginator
+
+    def get_page_number(self):
+        """Return the requested page number, or None if it is not an int."""
+        page = (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+        try:
+            return int(page)
+        except ValueError:
+            return None
+
+    def paginate_queryset(self, queryset, page_size):
+        """Paginate the queryset using pagination_strategy, if any."""
+        with self.profile_phase("pagination"):
+            if self.pagination_strategy == "window" and self.can_use_window_count(
+                queryset
+            ):
+                result = self.paginate_with_window_count(queryset, page_size)
+            else:
+                paginator, page, object_list, is_paginated = super(
+                    FilteredListView, self
+                ).paginate_queryset(queryset, page_size)
+
+                prefetched = getattr(self, "_prefetched", {})
+                if queryset is prefetched.get("queryset") and "page" in prefetched:
+                    number, rows = prefetched["page"]
+                    if number == page.number:
+                        page.object_list = object_list = rows
+                elif (
+                    self.pagination_strategy == "deferred_join"
+                    and page.start_index() > 1
+                    and self.can_use_deferred_join(queryset)
+                ):
+                    object_list = self.fetch_deferred_join(queryset, page)
+                    page.object_list = object_list
+                result = (paginator, page, object_list, is_paginated)
+            if self.get_cached_metadata("count", queryset) is None:
+                count = (result[0].count, time.time())
+                self.set_cached_metadata("count", queryset, count)
+            return result
+
+    def can_use_window_count(self, queryset):
+        """Return True if the count can be read from the page query."""
+        return (
+            isinstance(queryset, QuerySet)
+            and queryset._iterable_class in (ModelIterable, ValuesIterable)
+            and connections[queryset.db].features.supports_over_clause
+            and not queryset.query.distinct
+            and not queryset.query.combinator
+            and queryset.query.can_filter()
+            and not self.get_paginate_orphans()
+            and self.get_result_count(queryset) is None
+        )
+
+    def paginate_with_window_count(self, queryset, page_size):
+        """
+        Fetch the page and the total count with a single query annotating
+        ``COUNT(*) OVER ()`` on each row. A separate COUNT query is only
+        issued when the page is empty.
+        """
+        number = self.get_page_number()
+        if number is None or number < 1:
+            return super(FilteredListView, self).paginate_queryset(queryset, page_size)
+
+        offset = (number - 1) * page_size
+        rows = list(
+            queryset.annotate(
+                **{WINDOW_COUNT_ANNOTATION: Window(expression=Count("*"))}
+            )[offset : offset + page_size]
+        )
+        # get_result_count() is None: count rows with the page.
+        paginator = super(FilteredListView, self).get_paginator(
+            queryset, page_size, allow_empty_first_page=self.get_allow_empty()
+        )
+        if rows:
+            if isinstance(rows[0], dict):
+                paginator.count = rows[0][WINDOW_COUNT_ANNOTATION]
+                for row in rows:
+                    del row[WINDOW_COUNT_ANNOTATION]
+            else:
+                paginator.count = getattr(rows[0], WINDOW_COUNT_ANNOTATION)
+                for row in rows:
+                    delattr(row, WINDOW_COUNT_ANNOTATION)
+
+        try:
+            page = paginator.page(number)
+        except InvalidPage as e:
+            raise Http404(
+                _("Invalid page (%(page_number)s): %(message)s")
+                % {"page_number": number, "message": str(e)}
+            )
+        page.object_list = rows
+        return (paginator, page, rows, page.has_other_pages())
+
+    def can_use_deferred_join(self, queryset):
+        """Return True if the page rows can be fetched by primary key."""
+        return (
+            isinstance(queryset, QuerySet)
+            and queryset._iterable_class is ModelIterable
+            and not queryset.query.distinct
+            and not queryset.query.combinator
+        )
+
+    def fetch_deferred_join(self, queryset, page):
+        """
+        Return the objects of page: their primary keys are read first, with
+        the OFFSET and LIMIT of the page, then only the rows of those keys.
+        """
+        pks = list(page.object_list.values_list("pk", flat=True))
+        objects = {obj.pk: obj for obj in queryset.order_by().filter(pk__in=pks)}
+        return [objects[pk] for pk in pks if pk in objects]
+
+    def get_result_count(self, queryset):
+        """
+        Return the number of objects in queryset if it is known without
+        a COUNT query, None otherwise.
+        """
+        if queryset is getattr(self, "_indexed_queryset", None):
+            return self.filter_index.count(self._indexed_filters)
+        prefetched = getattr(self, "_prefetched", {})
+        if queryset is prefetched.get("queryset") and "count" in prefetched:
+            return prefetched["count"]
+        return self.get_cached_count(queryset)
+
+    def get_cached_count(self, queryset):
+        """
+        Return the count of queryset from metadata_cache, or None.
+
+        Counts older than count_stale_after seconds are still returned, but
+        are flagged as stale and recomputed in the background.
+        """
+        entry = self.get_cached_metadata("count", queryset)
+        if entry is None:
+            return None
+        count, computed_at = entry
+        if (
+            self.count_stale_after is not None
+            and time.time() - computed_at > self.count_stale_after
+        ):
+            self._count_is_stale = True
+            self.revalidate_count(queryset)
+        return count
+
+    def revalidate_count(self, queryset):
+        """
+        Recompute the cached count of queryset in a background thread.
+
+        A lock entry in metadata_cache ensures that only one thread of all
+        the processes sharing the cache recomputes a given count.
+        """
+        key = self.get_metadata_cache_key("count", queryset)
+        if not hasattr(self, "_revalidating"):
+            self._revalidating = set()
+        if key in self._revalidating:
+            return
+        self._revalidating.add(key)
+
+        cache = caches[self.metadata_cache]
+        lock_key = key + ":lock"
+        if not cache.add(lock_key, True, self.count_stale_after):
+            return
+        count_queryset = self.get_count_queryset(queryset)
+        timeout = self.metadata_cache_timeout
+
+        def refresh():
+            try:
+                cache.set(key, (count_queryset.count(), time.time()), timeout)
+            finally:
+                cache.delete(lock_key)
+
+        if parallel.can_run_in_threads(connections[queryset.db]):
+            executor = parallel.get_executor(self.parallel_queries_workers)
+            executor.submit(parallel.call, refresh)
+        else:
+            refresh()
+
+    def get_metadata_cache_key(self, name, queryset, *args):
+        """
+        Return the metadata_cache key of name for queryset and args, or
+        None if the SQL of queryset cannot be built.
+        """
+        if not isinstance(queryset, QuerySet):
+            return None
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        raw = repr(
+            (
+                self.__class__.__module__,
+                self.__class__.__qualname__,
+                queryset.db,
+                sql,
+                params,
+                args,
+            )
+        )
+        return "genericfilters:%s:%s" % (name, hashlib.md5(raw.encode()).hexdigest())
+
+    def get_cached_metadata(self, name, queryset, compute=None, *args):
+        """
+        Return the value of name for queryset from metadata_cache.
+
+        On a miss, the value is computed with compute() and stored, or None
+        is returned when compute is None.
+        """
+        key = None
+        if self.metadata_cache is not None:
+            key = self.get_metadata_cache_key(name, queryset, *args)
+        if key is None:
+            return compute() if compute is not None else None
+
+        if not hasattr(self, "_cached_metadata"):
+            self._cached_metadata = {}
+        if key in self._cached_metadata:
+            value = self._cached_metadata[key]
+        else:
+            value = caches[self.metadata_cache].get(key)
+        if value is None and compute is not None:
+            value = compute()
+            self.set_cached_metadata(name, queryset, value, *args)
+        self._cached_metadata[key] = value
+        return value
+
+    def set_cached_metadata(self, name, queryset, value, *args):
+        """Store the value of name for queryset in metadata_cache."""
+        if self.metadata_cache is None:
+            return
+        if not hasattr(self, "_cached_metadata"):
+            self._cached_metadata = {}
+        key = self.get_metadata_cache_key(name, queryset, *args)
+        if key is not None and self._cached_metadata.get(key) != value:
+            caches[self.metadata_cache].set(key, value, self.metadata_cache_timeout)
+            self._cached_metadata[key] = value
+
     def form_invalid(self, form):
         """Return queryset when submitted form is invalid.
 
@@ -162,7 +940,14 @@ class FilteredListView(FormMixin, ListView):
         """Return queryset used when form is not submitted."""
         queryset = self.__get_queryset()
         if self.default_order:
+            count_queryset = queryset
+            queryset = self.annotate_order(queryset, self.default_order)
             queryset = queryset.order_by(self.default_order)
+            if (
+                queryset.query.annotations.keys()
+                != count_queryset.query.annotations.keys()
+            ):
+                self._count_queryset = (queryset, count_queryset)
 
         return queryset
 
@@ -176,7 +961,9 @@ class FilteredListView(FormMixin, ListView):
             return self._form
         except AttributeError:
             form_class = self.get_form_class()
-            self._form = self.get_form(form_class)
+            with self.profile_phase("form"):
+                self._form = self.get_form(form_class)
+            self.bind_derived_choices(self._form)
 
             # Hide filter_fields
             if hasattr(self, "filter_fields"):
@@ -187,18 +974,297 @@ class FilteredListView(FormMixin, ListView):
 
             return self._form
 
+    def bind_derived_choices(self, form):
+        """Bind the unbound DerivedChoiceField of form to the view's queryset."""
+        lookups = {v: k for k, v in self.get_qs_filters().items()}
+        for name, field in form.fields.items():
+            if isinstance(field, DerivedChoiceField):
+                if field.field_name is None:
+                    field.field_name = lookups.get(name, name)
+                if field.queryset is None:
+                    field.queryset = self.__get_queryset()
+
     def get_context_data(self, **kwargs):
         """
         Add a list of filters and self.form to the context to be rendered by
         the view.
         """
+        if self.is_json_request():
+            kwargs.setdefault("object_list", self.get_json_queryset(self.object_list))
+        fragments = self.get_fragments()
+        queryset = kwargs.get("object_list", self.object_list)
+        if self.coalesce_requests and isinstance(queryset, QuerySet):
+            self.coalesce_queries(queryset)
+        if self.can_run_parallel_queries(queryset):
+            self.run_parallel_queries(
+                queryset, filters=fragments is None or "filters" in fragments
+            )
+
         kwargs = ListView.get_context_data(self, **kwargs)
         kwargs["form"] = self.form
-        kwargs["filters"] = self.get_filters()
+        if fragments is None or "filters" in fragments:
+            with self.profile_phase("filters"):
+                kwargs["filters"] = self.get_filters()
         kwargs["stacked_fields"] = getattr(self, "stacked_fields", [])
+        kwargs["count_is_stale"] = getattr(self, "_count_is_stale", False)
+        name = self.get_saved_search()
+        if name is not None:
+            entry = getattr(self, "_saved_search_entry", {})
+            refreshed = entry.get("refreshed")
+            if refreshed is not None:
+                refreshed = datetime.fromtimestamp(refreshed, timezone.utc)
+            kwargs["saved_search"] = Munch(name=name, refreshed=refreshed)
 
         return kwargs
 
+    def coalesce_queries(self, queryset):
+        """
+        Fetch the count and the page rows of queryset once for all the
+        concurrent requests of the same page, in this process or, with
+        coalesce_cache, in all the processes sharing that cache.
+        """
+        page_size = self.get_paginate_by(queryset)
+        number = self.get_page_number()
+        if (
+            not page_size
+            or self.pagination_strategy is not None
+            or self.get_paginate_orphans()
+            or number is None
+            or number < 1
+        ):
+            return
+        key = self.get_metadata_cache_key("coalesce", queryset, number, page_size)
+        if key is None:
+            return
+
+        def fetch():
+            count = self.get_result_count(queryset)
+            if count is None:
+                count = self.get_count_queryset(queryset).count()
+            rows = list(queryset[(number - 1) * page_size : number * page_size])
+            return {"count": count, "rows": rows}
+
+        cache = None
+        if self.coalesce_cache is not None:
+            cache = caches[self.coalesce_cache]
+        result = coalesce.single_flight(key, fetch, cache, self.coalesce_timeout)
+        self._prefetched = {
+            "queryset": queryset,
+            "count": result["count"],
+            "page": (number, list(result["rows"])),
+        }
+
+    def can_run_parallel_queries(self, queryset):
+        """
+        Return True if parallel_queries is set and the queries of queryset
+        can run in other threads (see parallel.can_run_in_threads()).
+        """
+        if not self.parallel_queries or not isinstance(queryset, QuerySet):
+            return False
+        return parallel.can_run_in_threads(connections[queryset.db])
+
+    def run_parallel_queries(self, queryset, filters=True):
+        """
+        Run the independent queries of the list on a thread pool: the total
+        count, the page rows, the choices of ModelChoiceField filters and
+        the facet counts. Results are used by paginate_queryset() and
+        get_filters().
+        """
+        tasks = {}
+        prefetched = getattr(self, "_prefetched", {})
+        if prefetched.get("queryset") is not queryset:
+            prefetched = {}
+        page_size = self.get_paginate_by(queryset)
+        if (
+            page_size
+            and self.pagination_strategy is None
+            and not self.get_paginate_orphans()
+        ):
+            if self.get_result_count(queryset) is None:
+                tasks["count"] = self.get_count_queryset(queryset).count
+            number = self.get_page_number()
+            if number is not None and number > 0 and "page" not in prefetched:
+                page = queryset[(number - 1) * page_size : number * page_size]
+                tasks["rows"] = partial(list, page)
+
+        choice_fields = []
+        if filters and hasattr(self, "filter_fields"):
+            for field in self.filter_fields:
+                form_field = self.form.fields[field]
+                if isinstance(form_field.choices, forms.models.ModelChoiceIterator):
+                    choice_fields.append(field)
+                    tasks["choices", field] = partial(
+                        self.get_cached_metadata,
+                        "choices",
+                        form_field.queryset,
+                        partial(list, iter(form_field.choices)),
+                    )
+            tasks["facets"] = self.get_facet_counts
+
+        results = parallel.run_in_threads(tasks, self.parallel_queries_workers)
+
+        for field in choice_fields:
+            self.form.fields[field].choices = results["choices", field]
+        self._prefetched = dict(prefetched, queryset=queryset)
+        if "count" in results:
+            self._prefetched["count"] = results["count"]
+        if "rows" in results:
+            self._prefetched["page"] = (number, results["rows"])
+        if "facets" in results:
+            self._prefetched["facets"] = results["facets"]
+
+    def get_fragments(self):
+        """
+        Return the names of the fragment_templates to render for a partial
+        response, or None to render the whole page.
+
+        Fragments are requested with a comma separated list in the
+        fragments_header request header. Fragments whose inputs did not
+        change since the URL in current_url_header are left out.
+        """
+        try:
+            return self._fragments
+        except AttributeError:
+            pass
+
+        requested = self.request.headers.get(self.fragments_header)
+        if requested is None:
+            self._fragments = None
+            return None
+
+        fragments = [
+            name.strip()
+            for name in requested.split(",")
+            if name.strip() in self.fragment_templates
+        ]
+        current_url = self.request.headers.get(self.current_url_header)
+        if current_url:
+            previous = QueryDict(urlsplit(current_url).query)
+            fragments = [
+                name
+                for name in fragments
+                if self.is_fragment_changed(name, previous, self.request.GET)
+            ]
+        self._fragments = fragments
+        return fragments
+
+    def is_fragment_changed(self, name, previous, current):
+        """
+        Return True if fragment name must be rendered again when the query
+        string changes from previous to current.
+
+        The filters fragment does not depend on the page number. Other
+        fragments are always rendered.
+        """
+        if name != "filters":
+            return True
+
+        def state(query):
+            return {
+                key: sorted(values)
+                for key, values in query.lists()
+                if key != self.page_kwarg
+            }
+
+        return state(previous) != state(current)
+
+    def is_json_request(self):
+        """
+        Return True if the list is requested as JSON, with the
+        ``?format=json`` parameter (json_format_param) or an Accept header.
+        JSON is only served by views declaring json_fields.
+        """
+        if self.json_fields is None:
+            return False
+        if self.request.GET.get(self.json_format_param) == "json":
+            return True
+        accept = self.request.headers.get("Accept", "")
+        return accept.split(",")[0].strip() == "application/json"
+
+    def get_json_queryset(self, queryset):
+        """Return queryset as dicts of json_fields, avoiding model instances."""
+        if not isinstance(queryset, QuerySet):
+            return queryset
+        values = queryset.values(*self.json_fields)
+        if queryset is getattr(self, "_indexed_queryset", None):
+            self._indexed_queryset = values
+        if self.get_count_queryset(queryset) is not queryset:
+            self._count_queryset = (values, self.get_count_queryset(queryset))
+        return values
+
+    def get_json_data(self, context):
+        """Return the JSON representation of the list from the context."""
+        rows = []
+        for row in context["object_list"]:
+            if not isinstance(row, dict):
+                row = {f: getattr(row, f) for f in self.json_fields}
+            rows.append(row)
+
+        page = context.get("page_obj")
+        if page is not None:
+            pagination = {
+                "count": page.paginator.count,
+                "num_pages": page.paginator.num_pages,
+                "per_page": page.paginator.per_page,
+                "page": page.number,
+                "has_next": page.has_next(),
+                "has_previous": page.has_previous(),
+            }
+        else:
+            pagination = {"count": len(rows)}
+
+        filters = []
+        for new_filter in context.get("filters", []):
+            choices = []
+            for choice in new_filter.choices:
+                json_choice = {
+                    "value": getattr(choice.value, "value", choice.value),
+                    "label": str(choice.label),
+                    "is_selected": choice.is_selected,
+                }
+                json_choice.update(
+                    (k, v) for k, v in choice.items() if k not in json_choice
+                )
+                choices.append(json_choice)
+            filters.append(
+                {
+                    "name": new_filter.name,
+                    "label": str(new_filter.label),
+                    "choices": choices,
+                }
+            )
+
+        return {"results": rows, "pagination": pagination, "filters": filters}
+
+    def render_to_response(self, context, **response_kwargs):
+        """Render the list as JSON or the requested fragments only, if any."""
+        fragments = self.get_fragments()
+        if self.is_json_request():
+            response_kwargs.setdefault("content_type", "application/json")
+            response = HttpResponse(
+                dumps(self.get_json_data(context)), **response_kwargs
+            )
+            patch_vary_headers(response, ["Accept"])
+            return response
+        elif fragments is None:
+            response = super(FilteredListView, self).render_to_response(
+                context, **response_kwargs
+            )
+        else:
+            content = "".join(
+                render_to_string(
+                    self.fragment_templates[name], context, request=self.request
+                )
+                for name in fragments
+            )
+            response = HttpResponse(content, **response_kwargs)
+            response[self.fragments_header] = ",".join(fragments)
+        patch_vary_headers(response, [self.fragments_header, self.current_url_header])
+        if self.json_fields:
+            # The same URL answers JSON to requests accepting it.
+            patch_vary_headers(response, ["Accept"])
+        return response
+
     def get_filters(self):
         """
         Convert some ChoiceField in a list of choices in the
@@ -206,11 +1272,23 @@ class FilteredListView(FormMixin, ListView):
         """
         filters = []
         if hasattr(self, "filter_fields"):
+            prefetched = getattr(self, "_prefetched", {})
+            if "facets" in prefetched:
+                facet_counts = prefetched["facets"]
+            else:
+                facet_counts = self.get_facet_counts()
+            self.load_cached_choices()
+            present = {}
+            if self.empty_choices:
+                present = self.get_present_values(facet_counts)
             for field in self.filter_fields:
+                counts = facet_counts.get(field)
                 new_filter = Munch()
                 new_filter.label = self.form.fields[field].label
                 new_filter.name = field
                 new_filter.choices = []
+                if counts is not None:
+                    new_filter.approximate = counts.approximate
                 selected = False
                 for choice in self.form.fields[field].choices:
                     new_choice = Munch()
@@ -235,6 +1313,21 @@ class FilteredListView(FormMixin, ListView):
                             new_choice.is_selected = False
                     else:
                         new_choice.is_selected = False
+                    if counts is not None:
+                        choice_value = getattr(choice[0], "value", choice[0])
+                        new_choice.count = counts.get(
+                            facet_key(yesno.get(choice_value, choice_value)), 0
+                        )
+                    if field in present and not new_choice.is_selected:
+                        choice_value = getattr(choice[0], "value", choice[0])
+                        key = facet_key(yesno.get(choice_value, choice_value))
+                        if (
+                            choice_value not in EMPTY_FILTER_VALUES
+                            and key not in present[field]
+                        ):
+                            if self.empty_choices == "hide":
+                                continue
+                            new_choice.disabled = True
                     new_filter.choices.append(new_choice)
 
                 if not self.form.fields[field].required and not [
@@ -247,3 +1340,214 @@ class FilteredListView(FormMixin, ListView):
                 filters.append(new_filter)
 
         return filters
+
+    def load_cached_choices(self):
+        """Read the choices of ModelChoiceField filters from metadata_cache."""
+        if self.metadata_cache is None:
+            return
+        for field in self.filter_fields:
+            form_field = self.form.fields[field]
+            if isinstance(form_field.choices, forms.models.ModelChoiceIterator):
+                form_field.choices = self.get_cached_metadata(
+                    "choices",
+                    form_field.queryset,
+                    partial(list, iter(form_field.choices)),
+                )
+
+    def get_present_values(self, facet_counts=None):
+        """
+        Return {field: set of facet_key(value)} of the values of
+        filter_fields found among the filtered objects.
+
+        Fields with exact facet counts use them, the others are read with one
+        ``DISTINCT`` query each, through metadata_cache. Fields whose filter
+        is set are left out, so that users can still switch their value.
+        """
+        queryset = self.get_count_queryset(getattr(self, "object_list", None))
+        if not isinstance(queryset, QuerySet):
+            return {}
+        facet_counts = facet_counts or {}
+        data = getattr(self.form, "cleaned_data", {})
+        present = {}
+        fields = []
+        for field in self.filter_fields:
+            if self.clean_qs_filter_field(field, data.get(field)) is not None:
+                continue
+            counts = facet_counts.get(field)
+            if counts is not None and not counts.approximate:
+                present[field] = {key for key, count in counts.items() if count}
+            else:
+                fields.append(field)
+        if fields:
+            present.update(
+                self.get_cached_metadata(
+                    "present",
+                    queryset,
+                    partial(self.find_present_values, queryset, fields),
+                    fields,
+                )
+            )
+        return present
+
+    def find_present_values(self, queryset, fields):
+        """Return the present values of fields among the objects of queryset."""
+        lookups = {v: k for k, v in self.get_qs_filters().items()}
+        queryset = queryset.order_by()
+        present = {}
+        for field in fields:
+            values = queryset.values_list(lookups.get(field, field), flat=True)
+            present[field] = {facet_key(value) for value in values.distinct()}
+        return present
+
+    def get_facet_counts(self):
+        """
+        Return the number of objects for each choice of filter_fields.
+
+        The result is a dict of {field: FacetCounts({facet_key(value): count})}.
+        Only fields whose counts can be computed are present: those answered
+        by filter_index, counted among the objects matching the other
+        filters, those of facet_counters when the list is not filtered, then
+        every field when facet_counts is set, counted among the filtered
+        objects.
+        """
+        counts = {}
+        lookups = {v: k for k, v in self.get_qs_filters().items()}
+        filters = getattr(self, "_indexed_filters", None)
+        if filters is not None:
+            for field in self.filter_fields:
+                lookup = lookups.get(field, field)
+                if lookup in self.filter_index.fields:
+                    others = {k: v for k, v in filters.items() if k != lookup}
+                    facet = self.filter_index.facet(lookup, others)
+                    counts[field] = FacetCounts(
+                        (facet_key(value), count) for value, count in facet.items()
+                    )
+
+        queryset = self.get_count_queryset(getattr(self, "object_list", None))
+        if self.can_use_facet_counters(queryset):
+            fields = {}
+            for field in self.filter_fields:
+                lookup = lookups.get(field, field)
+                if field not in counts and lookup in self.facet_counters.fields:
+                    fields[lookup] = field
+            for lookup, facet in self.facet_counters.counts(list(fields)).items():
+                counts[fields[lookup]] = facet
+
+        if self.facet_counts and isinstance(queryset, QuerySet):
+            sample_size = None
+            if self.facet_counts == "approximate":
+                sample_size = self.facet_sample_size
+            fields = [f for f in self.filter_fields if f not in counts]
+            counts.update(
+                self.get_cached_metadata(
+                    "facets",
+                    queryset,
+                    partial(self.count_facets, queryset, fields, sample_size),
+                    fields,
+                    sample_size,
+                )
+            )
+        return counts
+
+    def can_use_facet_counters(self, queryset):
+        """Return True if facet_counters hold the facet counts of queryset."""
+        return (
+            self.facet_counters is not None
+            and isinstance(queryset, QuerySet)
+            and queryset.model is self.facet_counters.model
+            and not queryset.query.has_filters()
+            and not queryset.query.distinct
+            and not queryset.query.combinator
+        )
+
+    def count_facets(self, queryset, fields, sample_size):
+        """Return the facet counts of fields among the objects of queryset."""
+        counts = {}
+        lookups = {v: k for k, v in self.get_qs_filters().items()}
+        counter = FacetCounter(queryset, sample_size)
+        for field in fields:
+            facet = counter.count(lookups.get(field, field))
+            counts[field] = FacetCounts(
+                (facet_key(value), count) for value, count in facet.items()
+            )
+            counts[field].approximate = facet.approximate
+        return counts
+
+
+class FilteredDashboardView(FilteredListView):
+    """
+    A FilteredListView rendering several lists of the filtered objects,
+    each with fixed filters of its own.
+
+    The form, filters and choices are shared by every list. The number of
+    objects of all the lists is computed by a single conditional
+    aggregate, then each list only runs the query of its page.
+    """
+
+    lists = None
+    list_paginate_by = 10
+
+    def get_lists(self):
+        """
+        Return the dict of lists: {name: {"filter": Q or dict of lookups,
+        "label": ..., "ordering": ..., "paginate_by": ...}}.
+        """
+        return self.lists or {}
+
+    def get_list_condition(self, spec):
+        """Return the Q object of the fixed filters of a list."""
+        condition = spec.get("filter", Q())
+        if isinstance(condition, dict):
+            condition = Q(**condition)
+        return condition
+
+    def count_lists(self, queryset, conditions):
+        """Return {name: count} of the objects of queryset matching conditions."""
+        queryset = self.get_count_queryset(queryset).order_by()
+        distinct = bool(queryset.query.distinct)
+        aliases = {"_count_%d" % i: name for i, name in enumerate(conditions)}
+        counts = queryset.aggregate(
+            **{
+                alias: Count("pk", filter=conditions[name], distinct=distinct)
+                for alias, name in aliases.items()
+            }
+        )
+        return {name: counts[alias] for alias, name in aliases.items()}
+
+    def get_list_contexts(self, queryset):
+        """Return a list of the context of each list, as Munch objects."""
+        lists = self.get_lists()
+        conditions = {
+            name: self.get_list_condition(spec) for name, spec in lists.items()
+        }
+        counts = self.count_lists(queryset, conditions) if conditions else {}
+
+        contexts = []
+        for name, spec in lists.items():
+            list_queryset = queryset.filter(conditions[name])
+            if spec.get("ordering"):
+                list_queryset = list_queryset.order_by(spec["ordering"])
+            paginator = self.paginator_class(
+                list_queryset, spec.get("paginate_by", self.list_paginate_by)
+            )
+            paginator.count = counts[name]
+            page_kwarg = "%s-%s" % (name, self.page_kwarg)
+            page = paginator.get_page(self.request.GET.get(page_kwarg))
+            contexts.append(
+                Munch(
+                    name=name,
+                    label=spec.get("label", name),
+                    paginator=paginator,
+                    page_obj=page,
+                    object_list=page.object_list,
+                    is_paginated=page.has_other_pages(),
+                    page_kwarg=page_kwarg,
+                )
+            )
+        return contexts
+
+    def get_context_data(self, **kwargs):
+        """Add the lists to the context."""
+        kwargs = super(FilteredDashboardView, self).get_context_data(**kwargs)
+        kwargs["lists"] = self.get_list_contexts(self.object_list)
+        return kwargs